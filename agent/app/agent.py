@@ -1,21 +1,37 @@
 """Core agent logic with multi-query search capability."""
 
-from typing import Literal, Dict, Any
+from collections import OrderedDict
+import contextlib
+from functools import lru_cache
+from typing import Literal, Dict, Any, List, Optional, Tuple
+import hashlib
+import httpx
+import json
+import logging
+import math
 import uuid
 from pydantic import BaseModel, Field
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, END
 from langchain_core.runnables import RunnableConfig
 from langgraph.types import Command, interrupt
 from langsmith import traceable
 from langsmith.run_helpers import get_current_run_tree
+import asyncio
 import time
 
 
 from app.state import AgentState
 from app.tools import tavily_search
-from app.memory import EpisodicMemoryManager
+from app.memory import get_memory_manager
 from app.prompts import (
     SUMMARIZATION_TEMPLATE,
     QUERY_CLASSIFICATION_TEMPLATE,
@@ -25,6 +41,79 @@ from app.prompts import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent Tavily calls per search node execution
+MAX_SEARCH_CONCURRENCY = 5
+
+# Connection pool shared by all OpenAI clients
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+LLM_MODEL = "gpt-4o-mini"
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Planned queries more similar than this to an earlier one are dropped
+QUERY_SIMILARITY_THRESHOLD = 0.92
+
+# In-process LRU of temperature-0 classification/planning responses
+LLM_CACHE_SIZE = 512
+_llm_response_cache: "OrderedDict[str, Any]" = OrderedDict()
+
+
+def _llm_cache_key(template_name: str, messages: List[BaseMessage]) -> str:
+    """Hash the model, template and exact prompt messages into a cache key."""
+    serialized = [(msg.type, str(msg.content)) for msg in messages]
+    payload = json.dumps([LLM_MODEL, template_name, serialized])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _llm_cache_get(key: str) -> Optional[Any]:
+    """Return a cached LLM response, marking it as recently used."""
+    if key not in _llm_response_cache:
+        return None
+    _llm_response_cache.move_to_end(key)
+    return _llm_response_cache[key]
+
+
+def _llm_cache_put(key: str, value: Any) -> None:
+    """Store an LLM response, evicting the least recently used entry when full."""
+    _llm_response_cache[key] = value
+    _llm_response_cache.move_to_end(key)
+    if len(_llm_response_cache) > LLM_CACHE_SIZE:
+        _llm_response_cache.popitem(last=False)
+
+
+# Number of recent user/assistant turn pairs sent to the LLM as history
+HISTORY_WINDOW_TURNS = 6
+
+# Prefix of classification notes left in the history by earlier runs
+CLASSIFICATION_PREFIX = "Classification:"
+
+
+def _conversation_history(
+    messages: List[BaseMessage], k: int = HISTORY_WINDOW_TURNS
+) -> List[BaseMessage]:
+    """Return the last k user/assistant pairs in a single backwards pass.
+
+    ToolMessages are dropped because OpenAI rejects them without matching
+    tool_calls, and classification notes from previous runs are skipped.
+    """
+    history = []
+    for msg in reversed(messages):
+        if len(history) == 2 * k:
+            break
+        if isinstance(msg, HumanMessage) or (
+            isinstance(msg, AIMessage)
+            and not (
+                isinstance(msg.content, str)
+                and msg.content.startswith(CLASSIFICATION_PREFIX)
+            )
+        ):
+            history.append(msg)
+    history.reverse()
+    return history
+
+
 # Structured output schema for classification
 class QueryClassification(BaseModel):
     """Classification of user query to determine processing approach."""
@@ -40,108 +129,153 @@ class QueryClassification(BaseModel):
         ge=0.0,
         le=1.0,
     )
+    planned_queries: List[str] = Field(
+        default_factory=list,
+        description="Up to 3 web search queries when classification is NEEDS_SEARCH, otherwise empty",
+    )
 
 
-def create_state_update(state: AgentState, **updates) -> Dict[str, Any]:
-    """Create a state update that preserves all existing fields."""
-    start_time = time.time()
-    
-    result = {
-        "messages": state.get("messages", []),
-        "search_count": state.get("search_count", 0),
-        "original_query": state.get("original_query", ""),
-        "planned_queries": state.get("planned_queries", []),
-        "search_results": state.get("search_results", []),
-        "needs_search": state.get("needs_search", False),
-        "user_feedback": state.get("user_feedback", ""),
-        **updates,
-    }
-    
-    total_time = time.time() - start_time
-    if total_time > 0.01:  # Only log if takes more than 10ms
-        search_results_size = len(str(result.get("search_results", [])))
-        messages_size = len(str(result.get("messages", [])))
-        print(f"🔍 TRACE: create_state_update took {total_time:.3f}s (search_results: {search_results_size} chars, messages: {messages_size} chars)")
-    
-    return result
+@lru_cache(maxsize=None)
+def get_async_http_client() -> httpx.AsyncClient:
+    """Shared keep-alive HTTP client so concurrent OpenAI calls reuse connections."""
+    return httpx.AsyncClient(limits=HTTP_LIMITS)
 
 
-def classification(
-    state: AgentState,
-) -> Command[Literal["planning", "direct_answer"]]:
-    """Classify whether query needs search or can be answered directly."""
-    # Use structured output for reliable classification
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0).with_structured_output(
-        QueryClassification
+@lru_cache(maxsize=None)
+def get_streaming_llm() -> ChatOpenAI:
+    """Shared streaming LLM client, created on first use and reused across nodes."""
+    return ChatOpenAI(
+        model=LLM_MODEL,
+        streaming=True,
+        temperature=0,
+        http_async_client=get_async_http_client(),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_classification_llm() -> ChatOpenAI:
+    """Shared JSON-mode LLM for query classification."""
+    return ChatOpenAI(
+        model=LLM_MODEL,
+        temperature=0,
+        model_kwargs={"response_format": {"type": "json_object"}},
+        http_async_client=get_async_http_client(),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_embeddings() -> OpenAIEmbeddings:
+    """Shared embeddings client for comparing planned queries."""
+    return OpenAIEmbeddings(
+        model=EMBEDDING_MODEL, http_async_client=get_async_http_client()
     )
 
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+async def embed_and_dedupe_queries(
+    current_query: str, queries: List[str]
+) -> Tuple[List[str], Optional[List[float]]]:
+    """Embed the user query and planned queries in one batch, dropping near-duplicate queries.
+
+    Returns the remaining queries and the user query's embedding (None if embedding failed).
+    """
+    # Exact duplicates (ignoring case) never need an embedding
+    unique = {}
+    for query in queries:
+        unique.setdefault(query.lower(), query)
+    queries = list(unique.values())
+
+    try:
+        vectors = await get_embeddings().aembed_documents([current_query, *queries])
+    except Exception as e:
+        logger.warning("⚠️ Query embedding skipped: %s", e)
+        return queries, None
+
+    query_embedding, query_vectors = vectors[0], vectors[1:]
+    kept = []
+    for i, vector in enumerate(query_vectors):
+        if all(
+            _cosine_similarity(vector, query_vectors[j]) <= QUERY_SIMILARITY_THRESHOLD
+            for j in kept
+        ):
+            kept.append(i)
+    return [queries[i] for i in kept], query_embedding
+
+
+async def classification(
+    state: AgentState,
+) -> Command[Literal["planning", "memory_check", "direct_answer"]]:
+    """Classify the query and, when it needs search, plan the queries in the same call."""
     # Get the current user message
     last_message = state["messages"][-1]
     current_query = (
         str(last_message.content) if isinstance(last_message, HumanMessage) else ""
     )
 
-    # Filter conversation history to only include user and assistant messages
-    # OpenAI API doesn't accept ToolMessage without proper tool_calls context
-    # Exclude the current user message (last message)
-    conversation_messages = []
-    for msg in state["messages"][:-1]:  # Exclude current user message
-        if isinstance(msg, (HumanMessage, AIMessage)):
-            # Skip classification messages from previous runs
-            if isinstance(msg, AIMessage) and str(msg.content).startswith(
-                "Classification:"
-            ):
-                continue
-            conversation_messages.append(msg)
-        # Skip ToolMessage objects as they cause OpenAI API errors
-
-    # Format conversation history for inclusion in system message
-    conversation_history = ""
-    if conversation_messages:
-        history_parts = []
-        for msg in conversation_messages:
-            if isinstance(msg, HumanMessage):
-                history_parts.append(f"User: {msg.content}")
-            elif isinstance(msg, AIMessage):
-                history_parts.append(f"Assistant: {msg.content}")
-        conversation_history = "\n".join(history_parts)
-    else:
-        conversation_history = "No previous conversation history."
+    # Prior user/assistant turns, excluding the current user message
+    conversation_messages = _conversation_history(state["messages"][:-1])
 
-    # Create system message with conversation history embedded
-    system_message = {
-        "role": "system",
-        "content": QUERY_CLASSIFICATION_TEMPLATE.format(
-            current_query=current_query, conversation_history=conversation_history
+    # Static system prompt first, then prior turns, then the current query, so the
+    # provider's prompt cache can reuse the unchanged prefix across turns
+    messages_for_llm = [
+        SystemMessage(
+            content=QUERY_CLASSIFICATION_TEMPLATE.format(current_date=current_date)
         ),
-    }
-
-    # Create a simple user message with just the current query
-    user_message = {"role": "user", "content": current_query}
-
-    # Pass system message + current query to LLM
-    messages_for_llm = [system_message, user_message]
-
-    # Get structured classification response
-    classification_result: QueryClassification = llm.invoke(messages_for_llm)
+        *conversation_messages,
+        HumanMessage(content=current_query),
+    ]
+
+    # Get classification response, reusing cached results for identical prompts
+    # JSON mode avoids the function-calling round-trip; the schema is validated locally
+    cache_key = _llm_cache_key("classification", messages_for_llm)
+    classification_result: Optional[QueryClassification] = _llm_cache_get(cache_key)
+    if classification_result is None:
+        response = await get_classification_llm().ainvoke(messages_for_llm)
+        classification_result = QueryClassification.model_validate_json(
+            str(response.content)
+        )
+        _llm_cache_put(cache_key, classification_result)
 
     # Extract classification decision
     needs_search = classification_result.classification == "NEEDS_SEARCH"
 
     if needs_search:
-        print(f"🔍 Classification: NEEDS_SEARCH - {classification_result.reasoning}")
-        print(f"   Confidence: {classification_result.confidence:.2f}")
-        goto = "planning"
+        logger.info(
+            "🔍 Classification: NEEDS_SEARCH - %s (confidence: %.2f)",
+            classification_result.reasoning,
+            classification_result.confidence,
+        )
+        queries, query_embedding = await embed_and_dedupe_queries(
+            current_query, classification_result.planned_queries[:3]
+        )
         update = {
             "original_query": current_query,
-            "planned_queries": [],
+            "query_embedding": query_embedding,
+            "planned_queries": queries,
             "search_results": [],
             "search_count": 0,
             "needs_search": True,
+            "user_feedback": "",
         }
+        if queries:
+            # Queries were planned alongside the classification, skip the planning call
+            goto = "memory_check"
+            update["messages"] = [
+                AIMessage(content=f"Planned {len(queries)} search queries")
+            ]
+        else:
+            goto = "planning"
     else:
-        print(f"💬 Classification: DIRECT_ANSWER - {classification_result.reasoning}")
-        print(f"   Confidence: {classification_result.confidence:.2f}")
+        logger.info(
+            "💬 Classification: DIRECT_ANSWER - %s (confidence: %.2f)",
+            classification_result.reasoning,
+            classification_result.confidence,
+        )
         goto = "direct_answer"
         update = {"original_query": current_query, "needs_search": False}
 
@@ -150,147 +284,103 @@ def classification(
 
 async def direct_answer(state: AgentState) -> Dict[str, Any]:
     """Answer query directly from conversation history."""
-    llm = ChatOpenAI(model="gpt-4o-mini", streaming=True, temperature=0)
+    llm = get_streaming_llm()
 
     # Get the current user message
     original_query = state["original_query"]
 
-    # Filter conversation history to only include user and assistant messages
-    # OpenAI API doesn't accept ToolMessage without proper tool_calls context
-    conversation_messages = []
-    for msg in state["messages"]:
-        if isinstance(msg, (HumanMessage, AIMessage)):
-            # Skip classification messages from previous runs
-            if isinstance(msg, AIMessage) and str(msg.content).startswith(
-                "Classification:"
-            ):
-                continue
-            conversation_messages.append(msg)
-        # Skip ToolMessage objects as they cause OpenAI API errors
-
-    # Format conversation history for inclusion in system message
-    conversation_history = ""
-    if conversation_messages:
-        history_parts = []
-        for msg in conversation_messages:
-            if isinstance(msg, HumanMessage):
-                history_parts.append(f"User: {msg.content}")
-            elif isinstance(msg, AIMessage):
-                history_parts.append(f"Assistant: {msg.content}")
-        conversation_history = "\n".join(history_parts)
-    else:
-        conversation_history = "No previous conversation history."
-
-    # Create system message with conversation history embedded
-    system_message = {
-        "role": "system",
-        "content": DIRECT_ANSWER_TEMPLATE.format(
-            original_query=original_query, conversation_history=conversation_history
-        ),
-    }
+    # Recent user/assistant turns, including the current user message
+    conversation_messages = _conversation_history(state["messages"])
 
-    # Create a simple user message with just the current query
-    user_message = {"role": "user", "content": original_query}
-
-    # Pass system message + current query to LLM
-    messages_for_llm = [system_message, user_message]
+    # Static system prompt first, then the conversation, ending with the current query
+    messages_for_llm = [SystemMessage(content=DIRECT_ANSWER_TEMPLATE), *conversation_messages]
+    if not (
+        conversation_messages
+        and isinstance(conversation_messages[-1], HumanMessage)
+        and conversation_messages[-1].content == original_query
+    ):
+        messages_for_llm.append(HumanMessage(content=original_query))
 
     response_content = ""
-    
+
     # Use the same streaming pattern as summarization_node
-    async for chunk in llm.astream([HumanMessage(content=system_message["content"] + "\n\n" + user_message["content"])]):
+    async for chunk in llm.astream(messages_for_llm):
         if hasattr(chunk, "content") and chunk.content:
             response_content += str(chunk.content)
 
-    return create_state_update(
-        state,
-        messages=[AIMessage(content=response_content)],
-        original_query=original_query,
-    )
+    return {"messages": [AIMessage(content=response_content)]}
 
 
 async def planning(state: AgentState) -> Dict[str, Any]:
-    """Analyze user query and plan search queries."""
-    llm = ChatOpenAI(model="gpt-4o-mini", streaming=True, temperature=0)
-
+    """Plan search queries when classification didn't, or revise them after user feedback."""
     # Get the current user message
     last_message = state["messages"][-1]
     current_query = (
         str(last_message.content) if isinstance(last_message, HumanMessage) else ""
     )
 
-    # Filter conversation history to only include user and assistant messages
-    # OpenAI API doesn't accept ToolMessage without proper tool_calls context
-    conversation_messages = []
-    for msg in state["messages"][:-1]:  # Exclude current user message
-        if isinstance(msg, (HumanMessage, AIMessage)):
-            # Skip classification messages from previous runs
-            if isinstance(msg, AIMessage) and str(msg.content).startswith(
-                "Classification:"
-            ):
-                continue
-            conversation_messages.append(msg)
-        # Skip ToolMessage objects as they cause OpenAI API errors
-
-    # Format conversation history for inclusion in system message
-    conversation_history = ""
-    if conversation_messages:
-        history_parts = []
-        for msg in conversation_messages:
-            if isinstance(msg, HumanMessage):
-                history_parts.append(f"User: {msg.content}")
-            elif isinstance(msg, AIMessage):
-                history_parts.append(f"Assistant: {msg.content}")
-        conversation_history = "\n".join(history_parts)
-    else:
-        conversation_history = "No previous conversation history."
+    # Prior user/assistant turns, excluding the current user message
+    conversation_messages = _conversation_history(state["messages"][:-1])
 
     # Check if there's user feedback to incorporate
     user_feedback = state.get("user_feedback", "")
     
-    # Create system message with conversation history embedded
-    planning_message = QUERY_PLANNING_TEMPLATE.format(
-        current_query=current_query,
-        conversation_history=conversation_history,
-        current_date=current_date
-    )
-
+    # Static system prompt first, then prior turns, then the current query, so the
+    # provider's prompt cache can reuse the unchanged prefix across turns
+    messages_for_llm = [
+        SystemMessage(content=QUERY_PLANNING_TEMPLATE.format(current_date=current_date)),
+        *conversation_messages,
+        HumanMessage(content=current_query),
+    ]
+
+    # Feedback goes after the query so it doesn't invalidate the cached prefix
     if user_feedback:
-        planning_message += f"\n\nUser feedback on previous queries: {user_feedback}\nPlease revise the queries based on this feedback."
+        messages_for_llm.append(
+            SystemMessage(
+                content=f"User feedback on previous queries: {user_feedback}\nPlease revise the queries based on this feedback."
+            )
+        )
 
-    # Create system message for planning
-    system_message = {
-        "role": "system",
-        "content": planning_message
-    }
+    cache_key = _llm_cache_key("planning", messages_for_llm)
+    response_content = _llm_cache_get(cache_key)
+    if response_content is None:
+        response_content = ""
+        async for chunk in get_streaming_llm().astream(messages_for_llm):
+            if hasattr(chunk, "content") and chunk.content:
+                response_content += str(chunk.content)
+        _llm_cache_put(cache_key, response_content)
 
-    # Create a simple user message with just the current query
-    user_message = {
-        "role": "user", 
-        "content": current_query
+    # Parse queries from response
+    queries = [q.strip() for q in response_content.strip().split("\n") if q.strip()]
+    queries = queries[:3]  # Limit to 3 queries max
+    queries, query_embedding = await embed_and_dedupe_queries(current_query, queries)
+
+    return {
+        "messages": [AIMessage(content=f"Planned {len(queries)} search queries")],
+        "original_query": current_query,
+        "query_embedding": query_embedding,
+        "planned_queries": queries,
+        "search_results": [],
+        "search_count": 0,
+        "user_feedback": "",  # Clear feedback after using it
     }
 
-    # Pass system message + current query to LLM
-    messages_for_llm = [system_message, user_message]
 
-    response_content = ""
-    async for chunk in llm.astream(messages_for_llm):
-        if hasattr(chunk, "content") and chunk.content:
-            response_content += str(chunk.content)
+# Strong references to in-flight background tasks so they aren't garbage collected
+_background_tasks: set = set()
 
-    # Parse queries from response
-    queries = [q.strip() for q in response_content.strip().split("\n") if q.strip()]
-    queries = queries[:3]  # Limit to 3 queries max
 
-    return create_state_update(
-        state,
-        messages=[AIMessage(content=f"Planned {len(queries)} search queries")],
-        original_query=current_query,
-        planned_queries=queries,
-        search_results=[],
-        search_count=0,
-        user_feedback="",  # Clear feedback after using it
-    )
+def _on_background_task_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error("❌ Background task failed: %s", task.exception())
+
+
+def _run_in_background(coro) -> None:
+    """Schedule a coroutine without awaiting it, logging any failure."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_task_done)
 
 
 @traceable
@@ -299,7 +389,7 @@ def human_review(state: AgentState) -> Dict[str, Any]:
     queries = state.get("planned_queries", [])
     current_query = state.get("original_query", "")
 
-    print(f"🔄 DEBUG: human_review called - queries: {queries}")
+    logger.debug("🔄 human_review called - queries: %s", queries)
 
     # Present queries to user for review using interrupt
     review_message = f"""I've planned the following search queries for: "{current_query}"
@@ -312,12 +402,12 @@ Options:
 - Provide feedback to improve the queries (e.g., "focus more on recent developments" or "add query about pricing")
 - Type "skip" to answer without searching"""
 
-    print(f"🔄 DEBUG: About to call interrupt with message: {review_message[:100]}...")
+    logger.debug("🔄 About to call interrupt with message: %.100s...", review_message)
 
     # Use interrupt to pause and wait for user input
     user_feedback_raw = interrupt(review_message)
 
-    print(f"🔄 DEBUG: interrupt returned: {user_feedback_raw}")
+    logger.debug("🔄 interrupt returned: %s", user_feedback_raw)
 
     # Extract the actual user input from the resume dictionary
     if isinstance(user_feedback_raw, dict):
@@ -326,13 +416,13 @@ Options:
     else:
         user_feedback = user_feedback_raw
 
-    print(f"🔄 DEBUG: processed user_feedback: {user_feedback}")
+    logger.debug("🔄 processed user_feedback: %s", user_feedback)
 
     # Update state with user feedback
-    return create_state_update(state, user_feedback=user_feedback)
+    return {"user_feedback": user_feedback}
 
 
-def process_feedback_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+async def process_feedback_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
     """Process user feedback from human review and store episodic memory."""
     user_input = state.get("user_feedback", "")
 
@@ -340,7 +430,7 @@ def process_feedback_node(state: AgentState, config: RunnableConfig) -> Dict[str
     current_query = state.get("original_query", "")
     planned_queries = state.get("planned_queries", [])
 
-    memory_manager = EpisodicMemoryManager(config)
+    memory_manager = get_memory_manager(config)
     if memory_manager.is_enabled() and current_query and planned_queries:
         # Determine user action
         if user_input and user_input.lower() == "approve":
@@ -350,108 +440,115 @@ def process_feedback_node(state: AgentState, config: RunnableConfig) -> Dict[str
         else:
             action = "feedback"
 
-        # Store rich episode for future learning
-        memory_manager.store_episode(
-            original_query=current_query,
-            planned_searches=planned_queries,
-            user_decision=action,
-            user_feedback_text=user_input if action == "feedback" else None,
+        # Store rich episode for future learning off the critical path
+        _run_in_background(
+            memory_manager.astore_episode(
+                original_query=current_query,
+                planned_searches=planned_queries,
+                user_decision=action,
+                user_feedback_text=user_input if action == "feedback" else None,
+                query_embedding=state.get("query_embedding"),
+            )
         )
 
-    if user_input and user_input.lower() == "approve":
-        # User approved, proceed to search
-        return create_state_update(state)
-    elif user_input and user_input.lower() == "skip":
-        # User wants to skip search and get direct answer
-        return create_state_update(state)
-    else:
-        # User provided feedback or no input, go back to planning with feedback
-        feedback = user_input if user_input else "Please revise the queries"
-        return create_state_update(
-            state,
-            messages=state["messages"]
-            + [HumanMessage(content=f"User feedback on planned queries: {feedback}")],
-            user_feedback=feedback,
-        )
+    if user_input and user_input.lower() in ["approve", "skip"]:
+        # User approved (proceed to search) or skipped (direct answer); state is unchanged
+        return {}
+
+    # User provided feedback or no input, go back to planning with feedback
+    feedback = user_input if user_input else "Please revise the queries"
+    return {
+        "messages": [HumanMessage(content=f"User feedback on planned queries: {feedback}")],
+        "user_feedback": feedback,
+    }
+
+
+async def run_searches(queries: List[str]) -> List[str]:
+    """Run Tavily searches concurrently, returning results in query order."""
+    logger.debug("🔍 Starting %d searches in parallel: %s", len(queries), queries)
+
+    # Bound outgoing Tavily calls; gather preserves the planned order
+    semaphore = asyncio.Semaphore(MAX_SEARCH_CONCURRENCY)
+
+    async def run_search(query: str) -> str:
+        async with semaphore:
+            return await tavily_search.ainvoke({"query": query})
+
+    search_start = time.time()
+    results = await asyncio.gather(*(run_search(q) for q in queries))
+    logger.debug(
+        "⚡ %d searches completed in %.2fs (%d characters)",
+        len(results),
+        time.time() - search_start,
+        sum(len(r) for r in results),
+    )
+    return results
+
+
+def search_state_update(state: AgentState, results: List[str]) -> Dict[str, Any]:
+    """State delta recording results for the planned queries still pending in state."""
+    planned_queries = state.get("planned_queries", [])
+    search_count = state.get("search_count", 0)
+    search_results = list(state.get("search_results", []))
+
+    tool_messages = []
+    for i, (query, result) in enumerate(zip(planned_queries[search_count:], results), search_count):
+        search_results.append({"query": query, "results": result})
+        tool_messages.append(ToolMessage(content=result, tool_call_id=f"search_{i}"))
+
+    return {
+        "messages": tool_messages,
+        "search_count": len(planned_queries),
+        "search_results": search_results,
+    }
 
 
 @traceable
 async def search_execution_node(state: AgentState) -> Dict[str, Any]:
-    """Execute the next planned search query."""
+    """Execute all remaining planned search queries concurrently."""
     run_tree = get_current_run_tree()
     start_time = time.time()
 
     planned_queries = state.get("planned_queries", [])
     search_count = state.get("search_count", 0)
-    search_results = state.get("search_results", [])
 
     if search_count >= len(planned_queries):
-        print(f"🔍 TRACE: No more searches needed (count: {search_count}, planned: {len(planned_queries)})")
-        return state  # No more queries to execute
+        logger.debug(
+            "🔍 No more searches needed (count: %d, planned: %d)",
+            search_count,
+            len(planned_queries),
+        )
+        return {}  # No more queries to execute
 
-    current_query = planned_queries[search_count]
-    print(f"🔍 TRACE: Starting search {search_count + 1}/{len(planned_queries)}: '{current_query}'")
+    pending_queries = planned_queries[search_count:]
 
     if run_tree:
         run_tree.extra = {
             "node": "search_execution",
-            "search_count": search_count + 1,
-            "query": current_query,
+            "search_count": len(planned_queries),
+            "queries": pending_queries,
             "start_time": start_time,
         }
 
     search_start = time.time()
-    results = await tavily_search.ainvoke({"query": current_query})
+    results = await run_searches(pending_queries)
     search_time = time.time() - search_start
-
-    print(f"⚡ TRACE: Search {search_count + 1} completed in {search_time:.2f}s")
-    print(f"📏 TRACE: Results length: {len(str(results))} characters")
+    results_length = sum(len(r) for r in results)
 
     if run_tree:
         run_tree.extra.update(
             {
                 "search_time": search_time,
-                "results_length": len(str(results)),
+                "results_length": results_length,
                 "total_time": time.time() - start_time,
             }
         )
 
-    search_results.append({"query": current_query, "results": results})
+    result = search_state_update(state, results)
 
-    # Track state update time
-    state_update_start = time.time()
-    result = create_state_update(
-        state,
-        messages=[ToolMessage(content=results, tool_call_id=f"search_{search_count}")],
-        search_count=search_count + 1,
-        search_results=search_results,
-    )
-    state_update_time = time.time() - state_update_start
-    
     total_time = time.time() - start_time
-    print(f"🔍 TRACE: Search {search_count + 1} node completed in {total_time:.3f}s (state_update: {state_update_time:.3f}s)")
-    
-    # Check if this was the last search
-    if search_count + 1 >= len(planned_queries):
-        print(f"🔍 TRACE: ✅ All searches completed ({search_count + 1}/{len(planned_queries)})")
-    
-    return result
+    logger.debug("🔍 ✅ All %d searches completed in %.3fs", len(planned_queries), total_time)
 
-
-@traceable
-def pre_summarize_node(state: AgentState) -> Dict[str, Any]:
-    """Signal that we're about to start summarization."""
-    start_time = time.time()
-    print(f"🔍 TRACE: pre_summarize_node entered at {start_time}")
-    
-    # Track state processing time
-    state_start = time.time()
-    result = create_state_update(state)
-    state_time = time.time() - state_start
-    
-    total_time = time.time() - start_time
-    print(f"🔍 TRACE: pre_summarize_node completed in {total_time:.3f}s (state_update: {state_time:.3f}s)")
-    
     return result
 
 
@@ -464,31 +561,33 @@ async def summarization_node(state: AgentState) -> Dict[str, Any]:
     if run_tree:
         run_tree.extra = {"node": "summarization", "start_time": start_time}
 
-    print(f"🔍 TRACE: Summarization node started at {start_time}")
+    logger.debug("🔍 Summarization node started at %s", start_time)
 
     # Track LLM initialization time
     llm_init_start = time.time()
-    llm = ChatOpenAI(model="gpt-4o-mini", streaming=True, temperature=0)
+    llm = get_streaming_llm()
     llm_init_time = time.time() - llm_init_start
-    print(f"⚡ TRACE: LLM initialization took {llm_init_time:.2f}s")
+    logger.debug("⚡ LLM initialization took %.2fs", llm_init_time)
 
     original_query = state.get("original_query", "")
     search_results = state.get("search_results", [])
 
     # Track data processing time
     processing_start = time.time()
-    combined_results = ""
-    for i, result in enumerate(search_results, 1):
-        combined_results += (
-            f"\n--- Search {i}: {result['query']} ---\n{result['results']}\n"
-        )
+    combined_results = "".join(
+        f"\n--- Search {i}: {result['query']} ---\n{result['results']}\n"
+        for i, result in enumerate(search_results, 1)
+    )
 
     summary_prompt = SUMMARIZATION_TEMPLATE.format(
         original_query=original_query, combined_results=combined_results
     )
     processing_time = time.time() - processing_start
-    print(f"📊 TRACE: Data processing took {processing_time:.2f}s")
-    print(f"📏 TRACE: Prompt length: {len(summary_prompt)} characters")
+    logger.debug(
+        "📊 Data processing took %.2fs (prompt length: %d characters)",
+        processing_time,
+        len(summary_prompt),
+    )
 
     if run_tree:
         run_tree.extra.update(
@@ -506,7 +605,9 @@ async def summarization_node(state: AgentState) -> Dict[str, Any]:
     response_content = ""
     token_count = 0
 
-    print(f"🚀 TRACE: Starting LLM streaming at {streaming_start}")
+    logger.debug("🚀 Starting LLM streaming at %s", streaming_start)
+
+    writer = get_stream_writer()
 
     try:
         async for chunk in llm.astream([HumanMessage(content=summary_prompt)]):
@@ -514,7 +615,7 @@ async def summarization_node(state: AgentState) -> Dict[str, Any]:
                 if first_token_time is None:
                     first_token_time = time.time()
                     ttft = first_token_time - streaming_start
-                    print(f"⚡ TRACE: Time to first token: {ttft:.2f}s")
+                    logger.debug("⚡ Time to first token: %.2fs", ttft)
 
                     if run_tree:
                         run_tree.extra.update(
@@ -527,14 +628,17 @@ async def summarization_node(state: AgentState) -> Dict[str, Any]:
                 response_content += str(chunk.content)
                 token_count += 1
 
+                # Push each token to "custom" stream consumers as soon as it arrives
+                writer({"type": "answer", "content": str(chunk.content)})
+
                 # Log progress every 50 tokens
-                if token_count % 50 == 0:
+                if token_count % 50 == 0 and logger.isEnabledFor(logging.DEBUG):
                     elapsed = time.time() - streaming_start
-                    print(f"🔄 TRACE: {token_count} tokens in {elapsed:.2f}s")
+                    logger.debug("🔄 %d tokens in %.2fs", token_count, elapsed)
 
     except Exception as e:
         error_time = time.time() - start_time
-        print(f"❌ TRACE: Error after {error_time:.2f}s: {e}")
+        logger.error("❌ Summarization error after %.2fs: %s", error_time, e)
         if run_tree:
             run_tree.extra.update({"error": str(e), "error_time": error_time})
         raise
@@ -542,9 +646,14 @@ async def summarization_node(state: AgentState) -> Dict[str, Any]:
     total_time = time.time() - start_time
     streaming_time = time.time() - streaming_start
 
-    print(f"✅ TRACE: Summarization completed in {total_time:.2f}s")
-    print(f"📈 TRACE: Streaming took {streaming_time:.2f}s for {token_count} tokens")
-    print(f"📊 TRACE: Average token rate: {token_count / streaming_time:.1f} tokens/s")
+    tokens_per_second = token_count / streaming_time if streaming_time > 0 else 0
+    logger.debug(
+        "✅ Summarization completed in %.2fs (streaming %.2fs, %d tokens, %.1f tokens/s)",
+        total_time,
+        streaming_time,
+        token_count,
+        tokens_per_second,
+    )
 
     if run_tree:
         run_tree.extra.update(
@@ -552,48 +661,68 @@ async def summarization_node(state: AgentState) -> Dict[str, Any]:
                 "total_time": total_time,
                 "streaming_time": streaming_time,
                 "token_count": token_count,
-                "tokens_per_second": token_count / streaming_time
-                if streaming_time > 0
-                else 0,
+                "tokens_per_second": tokens_per_second,
                 "response_length": len(response_content),
             }
         )
 
-    return create_state_update(state, messages=[AIMessage(content=response_content)])
+    return {"messages": [AIMessage(content=response_content)]}
 
 
-def memory_check_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+async def memory_check_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
     """Check if we should auto-decide based on learned episodic patterns."""
     # Get current query and planned searches
     current_query = state.get("original_query", "")
     planned_searches = state.get("planned_queries", [])
 
-    print(
-        f"🔄 DEBUG: memory_check_node - query: '{current_query}', searches: {planned_searches}"
+    logger.debug(
+        "🔄 memory_check_node - query: '%s', searches: %s", current_query, planned_searches
     )
 
-    # Initialize episodic memory manager with config for store access
-    memory_manager = EpisodicMemoryManager(config)
+    # Reuse the episodic memory manager for this user (store access comes from the graph context)
+    memory_manager = get_memory_manager(config)
 
-    print(f"🔄 DEBUG: memory_manager.is_enabled(): {memory_manager.is_enabled()}")
+    logger.debug("🔄 memory_manager.is_enabled(): %s", memory_manager.is_enabled())
 
     if memory_manager.is_enabled() and current_query and planned_searches:
-        # Use episodic memory to determine if we should auto-decide
-        auto_decision = memory_manager.should_auto_decide(
-            current_query, planned_searches
-        )
-
-        print(f"🔄 DEBUG: auto_decision: {auto_decision}")
+        # Searches start speculatively while the decision LLM deliberates, since
+        # approval is the common outcome; the results are discarded otherwise
+        search_task = None
+
+        def start_speculative_search():
+            nonlocal search_task
+            search_task = asyncio.create_task(run_searches(planned_searches))
+
+        try:
+            # Use episodic memory to determine if we should auto-decide
+            auto_decision = await memory_manager.should_auto_decide(
+                current_query,
+                planned_searches,
+                state.get("query_embedding"),
+                on_llm_decision=start_speculative_search,
+            )
+
+            logger.debug("🔄 auto_decision: %s", auto_decision)
+
+            if auto_decision == "approve" and search_task:
+                # Searches already ran; the search node will find nothing pending
+                return {"user_feedback": auto_decision, **search_state_update(state, await search_task)}
+        finally:
+            # Stop unused speculative searches on every other path, including errors
+            if search_task and not search_task.done():
+                search_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await search_task
 
         if auto_decision:
             # Store the auto-decision as user feedback for downstream processing
-            return create_state_update(state, user_feedback=auto_decision)
+            return {"user_feedback": auto_decision}
     else:
-        print("🔄 DEBUG: Memory not enabled or missing data")
+        logger.debug("🔄 Memory not enabled or missing data")
 
     # No auto-decision made, proceed with normal flow
-    print("🔄 DEBUG: No auto-decision, proceeding to human review")
-    return create_state_update(state)
+    logger.debug("🔄 No auto-decision, proceeding to human review")
+    return {}
 
 
 def after_memory_check(
@@ -602,15 +731,15 @@ def after_memory_check(
     """Determine next step after memory check."""
     user_feedback = state.get("user_feedback", "")
 
-    print(f"🔄 DEBUG: after_memory_check - user_feedback: '{user_feedback}'")
+    logger.debug("🔄 after_memory_check - user_feedback: '%s'", user_feedback)
 
     # If memory made an auto-decision, skip human review
     if user_feedback in ["approve", "skip"]:
-        print(f"🧠 Memory auto-decided: {user_feedback}")
+        logger.info("🧠 Memory auto-decided: %s", user_feedback)
         return "process_feedback"
 
     # Otherwise, ask human for review
-    print("👤 Going to human review")
+    logger.debug("👤 Going to human review")
     return "human_review"
 
 
@@ -642,45 +771,18 @@ def after_process_feedback(
     return "search"
 
 
-def after_search(state: AgentState) -> Literal["search", "pre_summarize", "__end__"]:
-    """Determine next step after executing a search."""
-    start_time = time.time()
-    print(f"🔍 TRACE: after_search routing entered at {start_time}")
-    
-    planned_queries = state.get("planned_queries", [])
+def after_search(state: AgentState) -> Literal["summarize", "__end__"]:
+    """Determine next step after executing the searches."""
     search_count = state.get("search_count", 0)
-    
-    print(f"🔍 TRACE: after_search - search_count: {search_count}, planned_queries: {len(planned_queries)}")
-
-    # If we have more searches to do, continue searching
-    if search_count < len(planned_queries):
-        decision = "search"
-        print(f"🔍 TRACE: after_search decision: {decision} (more searches needed)")
-        return decision
 
-    # If we've done all searches, go to pre-summarization signal
-    if search_count >= len(planned_queries) and search_count > 0:
-        decision = "pre_summarize"
-        total_time = time.time() - start_time
-        print(f"🔍 TRACE: after_search decision: {decision} (all searches complete) - took {total_time:.3f}s")
-        return decision
+    # All planned searches run in a single node invocation
+    if search_count > 0:
+        logger.debug("🔍 after_search decision: summarize (%d searches complete)", search_count)
+        return "summarize"
 
     # Fallback (shouldn't happen)
-    decision = "__end__"
-    print(f"🔍 TRACE: after_search decision: {decision} (fallback)")
-    return decision
-
-
-def after_pre_summarize(state: AgentState) -> Literal["summarize"]:
-    """Determine next step after pre-summarization signal."""
-    start_time = time.time()
-    print(f"🔍 TRACE: after_pre_summarize routing entered at {start_time}")
-    
-    decision = "summarize"
-    total_time = time.time() - start_time
-    print(f"🔍 TRACE: after_pre_summarize decision: {decision} - took {total_time:.3f}s")
-    
-    return decision
+    logger.debug("🔍 after_search decision: __end__ (fallback)")
+    return "__end__"
 
 
 def create_agent(use_memory: bool = False):
@@ -698,7 +800,6 @@ def create_agent(use_memory: bool = False):
     workflow.add_node("human_review", human_review)
     workflow.add_node("process_feedback", process_feedback_node)
     workflow.add_node("search", search_execution_node)
-    workflow.add_node("pre_summarize", pre_summarize_node)
     workflow.add_node("summarize", summarization_node)
 
     workflow.set_entry_point("classification")
@@ -709,7 +810,6 @@ def create_agent(use_memory: bool = False):
     workflow.add_conditional_edges("human_review", after_human_review)
     workflow.add_conditional_edges("process_feedback", after_process_feedback)
     workflow.add_conditional_edges("search", after_search)
-    workflow.add_conditional_edges("pre_summarize", after_pre_summarize)
     workflow.add_conditional_edges("summarize", lambda _: END)
 
     # Add in-memory checkpointer if requested (only for local development)
@@ -1,9 +1,11 @@
 """Main entry point for the ReAct agent."""
 
 import asyncio
+import logging
 from dotenv import load_dotenv
 
 from app.runner import run_agent
+from app.tools import close_search_session
 
 # Load environment variables - local .env takes precedence over root .env
 load_dotenv(dotenv_path="../../.env")  # Root .env first
@@ -41,9 +43,12 @@ async def async_main():
         use_memory,
     )
 
+    await close_search_session()
+
 
 def main():
     """Synchronous main function for CLI entry point."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     asyncio.run(async_main())
 
 
@@ -1,10 +1,39 @@
 """Long-term memory management for learning user review preferences."""
 
-from typing import Optional, List, Literal
+import hashlib
+from array import array
+import heapq
+import math
+import re
+from collections import Counter, OrderedDict
+from functools import cached_property, lru_cache
+from typing import Any, Callable, Dict, Optional, List, Literal, Tuple
 from pydantic import BaseModel, Field
 from langchain_core.runnables import RunnableConfig
+from app.prompts import EPISODIC_DECISION_TEMPLATE
 
+# Minimum vector-search similarity for a stored episode to count as similar
+EPISODE_SIMILARITY_THRESHOLD = 0.75
 
+# Similar-episode lookups cached per manager; cleared whenever a new episode is stored
+EPISODE_SEARCH_CACHE_SIZE = 128
+
+# Number of similar episodes considered for an auto-decision, and the minimum needed
+EPISODE_SEARCH_LIMIT = 5
+MIN_SIMILAR_EPISODES = 3
+
+# Most recent episodes kept in the in-process index per manager
+EPISODE_INDEX_SIZE = 256
+
+# Keyword patterns for query complexity (substring matches, case-insensitive)
+_SIMPLE_QUERY_RE = re.compile(r"weather|time|what is", re.IGNORECASE)
+_COMPLEX_QUERY_RE = re.compile(r"compare|analyze|research|comprehensive", re.IGNORECASE)
+
+# Hybrid ranking of indexed episodes: weight of normalized BM25 keyword score vs. cosine
+EPISODE_LEXICAL_WEIGHT = 0.4
+BM25_K1 = 1.5
+BM25_B = 0.75
+_TOKEN_RE = re.compile(r"\w+")
 
 
 class EpisodicDecision(BaseModel):
@@ -47,18 +76,24 @@ class EpisodicReviewMemory(BaseModel):
     )
     timestamp: str = Field(description="When this episode occurred")
     
-    def get_searchable_content(self) -> str:
-        """Create content string for semantic search embedding."""
-        content = f"Query: {self.original_query}\n"
-        content += f"Planned searches: {', '.join(self.planned_searches)}\n"
-        content += f"Complexity: {self.query_complexity}, Search quality: {self.search_quality}\n"
-        content += f"User decision: {self.user_decision}\n"
+    @cached_property
+    def searchable_content(self) -> str:
+        """Content string for semantic search embedding, built once per episode."""
+        parts = [
+            f"Query: {self.original_query}",
+            f"Planned searches: {', '.join(self.planned_searches)}",
+            f"Complexity: {self.query_complexity}, Search quality: {self.search_quality}",
+            f"User decision: {self.user_decision}",
+        ]
         if self.user_feedback_text:
-            content += f"User feedback: {self.user_feedback_text}\n"
-        content += f"Context: {self.decision_context}"
-        return content
+            parts.append(f"User feedback: {self.user_feedback_text}")
+        parts.append(f"Context: {self.decision_context}")
+        return "\n".join(parts)
 
 
+_REQUIRED_EPISODE_FIELDS = frozenset(
+    name for name, field in EpisodicReviewMemory.model_fields.items() if field.is_required()
+)
 
 
 class EpisodicMemoryManager:
@@ -66,23 +101,32 @@ class EpisodicMemoryManager:
 
     def __init__(self, config: Optional[RunnableConfig] = None):
         self.config = config
+        # Get user_id from config for store namespacing
+        user_id = "default_user"  # fallback
+        if config and "configurable" in config:
+            user_id = config["configurable"].get("user_id", "default_user")
+        self._namespace = ("users", user_id, "episodic_reviews")
         self.episode_manager = None
         self.llm = None
+        self._search_cache: "OrderedDict[str, List[EpisodicReviewMemory]]" = OrderedDict()
+        # In-process index of episodes stored by this manager, aligned with unit-length
+        # embeddings of their original query packed as float32 (6 KB per episode)
+        self._indexed_episodes: List[EpisodicReviewMemory] = []
+        self._episode_vectors: List[array] = []
+        # BM25 term statistics over each indexed episode's query and planned searches
+        self._episode_terms: List[Counter] = []
+        self._term_doc_freq: Counter = Counter()
+        self._total_terms = 0
 
         # Only initialize if langmem is available
         try:
             from langmem import create_memory_store_manager
             from langchain_openai import ChatOpenAI
 
-            # Get user_id from config for store namespacing
-            user_id = "default_user"  # fallback
-            if config and "configurable" in config:
-                user_id = config["configurable"].get("user_id", "default_user")
-
             # Episode manager using store for semantic search
             self.episode_manager = create_memory_store_manager(
                 "openai:gpt-4o-mini",
-                namespace=("users", user_id, "episodic_reviews"),
+                namespace=self._namespace,
                 schemas=[EpisodicReviewMemory],
                 instructions="Store rich episodes of user review interactions for semantic similarity learning.",
                 enable_inserts=True,  # Allow multiple episodes
@@ -100,26 +144,44 @@ class EpisodicMemoryManager:
         """Check if episodic memory is enabled."""
         return self.episode_manager is not None and self.llm is not None
 
-    def should_auto_decide(
+    async def should_auto_decide(
         self, 
         current_query: str, 
-        planned_searches: List[str]
+        planned_searches: List[str],
+        query_embedding: Optional[List[float]] = None,
+        on_llm_decision: Optional[Callable[[], None]] = None
     ) -> Optional[Literal["approve", "skip"]]:
-        """Use episodic memory and LLM reasoning to decide if we should auto-approve/skip."""
+        """Use episodic memory and LLM reasoning to decide if we should auto-approve/skip.
+
+        on_llm_decision is called just before the decision LLM round-trip, so callers
+        can overlap speculative work with it.
+        """
         if not self.is_enabled():
             return None
 
         try:
             # Find similar episodes using semantic search
-            similar_episodes = self._find_similar_episodes(current_query, planned_searches)
+            similar_episodes = await self._find_similar_episodes(
+                current_query, planned_searches, query_embedding
+            )
             
-            # Need at least 3 episodes for confident decision
-            if len(similar_episodes) < 3:
+            # Need at least 3 sufficiently similar episodes for confident decision,
+            # otherwise skip the LLM call entirely
+            if len(similar_episodes) < MIN_SIMILAR_EPISODES:
                 print("📝 Insufficient episodic data for auto-decision")
                 return None
 
+            # Every similar episode ended the same way: no LLM reasoning needed
+            decisions = {episode.user_decision for episode in similar_episodes}
+            if len(decisions) == 1:
+                decision = decisions.pop()
+                print(f"🧠 Unanimous episodic decision: {decision}")
+                return decision if decision in ("approve", "skip") else None
+
             # Use LLM to reason about the decision based on similar episodes
-            decision = self._llm_decide_with_episodes(
+            if on_llm_decision:
+                on_llm_decision()
+            decision = await self._llm_decide_with_episodes(
                 current_query, planned_searches, similar_episodes
             )
             
@@ -129,12 +191,21 @@ class EpisodicMemoryManager:
             print(f"📝 Error in episodic auto-decision: {e}")
             return None
 
-    def _find_similar_episodes(
+    async def _find_similar_episodes(
         self, 
         current_query: str, 
-        planned_searches: List[str]
+        planned_searches: List[str],
+        query_embedding: Optional[List[float]] = None
     ) -> List[EpisodicReviewMemory]:
-        """Find semantically similar episodes from memory store."""
+        """Find semantically similar episodes, from the in-process index when warm or the memory store."""
+        # Rank locally indexed episodes against the query embedding already computed
+        # during classification; only when too few match, ask the store, which also
+        # holds episodes from earlier runs and other workers
+        if query_embedding and len(self._indexed_episodes) >= MIN_SIMILAR_EPISODES:
+            episodes = self._search_index(current_query, query_embedding)
+            if len(episodes) >= MIN_SIMILAR_EPISODES:
+                return episodes
+
         try:
             from langgraph.config import get_store
             
@@ -143,37 +214,106 @@ class EpisodicMemoryManager:
             if not store:
                 return []
 
-            # Get user_id for namespace
-            user_id = "default_user"
-            if self.config and "configurable" in self.config:
-                user_id = self.config["configurable"].get("user_id", "default_user")
-
             # Create search content for current situation
             search_content = f"Query: {current_query}\nPlanned searches: {', '.join(planned_searches)}"
-            
+
+            # Identical situations skip the store's embedding + vector search round-trip
+            cache_key = hashlib.sha256(search_content.encode()).hexdigest()
+            if cache_key in self._search_cache:
+                self._search_cache.move_to_end(cache_key)
+                return self._search_cache[cache_key]
+
             # Search for similar episodes
-            results = store.search(
-                namespace=("users", user_id, "episodic_reviews"),
+            results = await store.asearch(
+                self._namespace,
                 query=search_content,
-                limit=5  # Get top 5 most similar
+                limit=EPISODE_SEARCH_LIMIT
             )
 
             episodes = []
             for result in results:
-                if hasattr(result, 'value') and isinstance(result.value, dict):
-                    try:
-                        episode = EpisodicReviewMemory(**result.value)
-                        episodes.append(episode)
-                    except Exception:
-                        continue
-
+                # Results come back ranked by the store's vector index; anything below
+                # the similarity threshold is not a comparable episode
+                score = getattr(result, "score", None)
+                if score is not None and score < EPISODE_SIMILARITY_THRESHOLD:
+                    break
+                value = getattr(result, "value", None)
+                if not isinstance(value, dict):
+                    continue
+                # langmem stores memories as {"kind": ..., "content": {...}}
+                value = value.get("content", value)
+                if isinstance(value, dict) and _REQUIRED_EPISODE_FIELDS <= value.keys():
+                    # Episodes were validated when stored, so skip re-validation on read
+                    episodes.append(EpisodicReviewMemory.model_construct(**value))
+
+            self._search_cache[cache_key] = episodes
+            if len(self._search_cache) > EPISODE_SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
             return episodes
 
         except Exception as e:
             print(f"📝 Error finding similar episodes: {e}")
             return []
 
-    def _llm_decide_with_episodes(
+    def _search_index(
+        self, current_query: str, query_embedding: List[float]
+    ) -> List[EpisodicReviewMemory]:
+        """Return indexed episodes above the similarity threshold, ranked by hybrid BM25 + cosine score."""
+        query_vector = _unit_vector(query_embedding)
+        lexical = self._bm25_scores(_tokenize(current_query))
+        top_lexical = max(lexical) or 1.0
+        scored = []
+        for i, vector in enumerate(self._episode_vectors):
+            cosine = sum(x * y for x, y in zip(query_vector, vector))
+            if cosine >= EPISODE_SIMILARITY_THRESHOLD:
+                lexical_score = lexical[i] / top_lexical
+                scored.append(
+                    (EPISODE_LEXICAL_WEIGHT * lexical_score + (1 - EPISODE_LEXICAL_WEIGHT) * cosine, i)
+                )
+        return [self._indexed_episodes[i] for _, i in heapq.nlargest(EPISODE_SEARCH_LIMIT, scored)]
+
+    def _bm25_scores(self, query_terms: List[str]) -> List[float]:
+        """BM25 score of every indexed episode for the query terms."""
+        doc_count = len(self._episode_terms)
+        avg_length = self._total_terms / doc_count or 1.0
+        idf = {}
+        for term in set(query_terms):
+            doc_freq = self._term_doc_freq[term]
+            if doc_freq:
+                idf[term] = math.log((doc_count - doc_freq + 0.5) / (doc_freq + 0.5) + 1)
+        scores = []
+        for terms in self._episode_terms:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * sum(terms.values()) / avg_length)
+            scores.append(sum(
+                weight * terms[term] * (BM25_K1 + 1) / (terms[term] + norm)
+                for term, weight in idf.items()
+                if term in terms
+            ))
+        return scores
+
+    def _index_episode(
+        self, episode: EpisodicReviewMemory, query_embedding: Optional[List[float]]
+    ):
+        """Add a stored episode to the in-process index and invalidate cached lookups."""
+        self._search_cache.clear()
+        if query_embedding:
+            self._indexed_episodes.append(episode)
+            self._episode_vectors.append(array("f", _unit_vector(query_embedding)))
+            terms = Counter(_tokenize(" ".join([episode.original_query, *episode.planned_searches])))
+            self._episode_terms.append(terms)
+            self._term_doc_freq.update(terms.keys())
+            self._total_terms += sum(terms.values())
+            if len(self._indexed_episodes) > EPISODE_INDEX_SIZE:
+                # Evict the oldest episode and its BM25 statistics
+                del self._indexed_episodes[0], self._episode_vectors[0]
+                evicted = self._episode_terms.pop(0)
+                for term in evicted:
+                    self._term_doc_freq[term] -= 1
+                    if not self._term_doc_freq[term]:
+                        del self._term_doc_freq[term]
+                self._total_terms -= sum(evicted.values())
+
+    async def _llm_decide_with_episodes(
         self,
         current_query: str,
         planned_searches: List[str],
@@ -183,12 +323,10 @@ class EpisodicMemoryManager:
         
         # Build context from similar episodes
         episodes_context = "\n\n".join([
-            f"Episode {i+1}:\n{episode.get_searchable_content()}" 
-            for i, episode in enumerate(similar_episodes)
+            f"Episode {i}:\n{episode.searchable_content}"
+            for i, episode in enumerate(similar_episodes, start=1)
         ])
 
-        from app.prompts import EPISODIC_DECISION_TEMPLATE
-        
         prompt = EPISODIC_DECISION_TEMPLATE.format(
             current_query=current_query,
             planned_searches=', '.join(planned_searches),
@@ -196,7 +334,7 @@ class EpisodicMemoryManager:
         )
 
         try:
-            decision_result: EpisodicDecision = self.llm.invoke([{"role": "user", "content": prompt}])
+            decision_result: EpisodicDecision = await self.llm.ainvoke([{"role": "user", "content": prompt}])
             
             print(f"🧠 Episodic decision: {decision_result.decision}")
             print(f"📝 Reasoning: {decision_result.reasoning}")
@@ -214,66 +352,114 @@ class EpisodicMemoryManager:
             print(f"📝 Error in LLM decision making: {e}")
             return None
 
-    def store_episode(
+    def _build_episode(
         self,
         original_query: str,
         planned_searches: List[str],
         user_decision: str,
         user_feedback_text: Optional[str] = None
+    ) -> EpisodicReviewMemory:
+        """Build a rich review episode from a user review interaction."""
+        from datetime import datetime
+
+        # Analyze query complexity
+        complexity = self._assess_query_complexity(original_query)
+
+        # Analyze search quality
+        search_quality = self._assess_search_quality(planned_searches)
+
+        # Generate decision context
+        decision_context = self._generate_decision_context(
+            complexity, search_quality, len(planned_searches), user_decision, user_feedback_text
+        )
+
+        # Create rich episode
+        return EpisodicReviewMemory(
+            original_query=original_query,
+            planned_searches=planned_searches,
+            user_decision=user_decision,
+            user_feedback_text=user_feedback_text,
+            decision_context=decision_context,
+            query_complexity=complexity,
+            search_quality=search_quality,
+            timestamp=datetime.now().isoformat()
+        )
+
+    def _prepare_episode(
+        self,
+        original_query: str,
+        planned_searches: List[str],
+        user_decision: str,
+        user_feedback_text: Optional[str],
+        query_embedding: Optional[List[float]]
+    ) -> Tuple[Dict[str, Any], Callable[[], None]]:
+        """Build an episode's langmem input and the callback that indexes it once stored."""
+        episode = self._build_episode(
+            original_query, planned_searches, user_decision, user_feedback_text
+        )
+        memory_input = {"messages": [{
+            "role": "user",
+            "content": f"Store this review episode: {episode.searchable_content}"
+        }]}
+
+        def on_stored():
+            self._index_episode(episode, query_embedding)
+            print(f"📝 Stored episodic memory: {user_decision} for '{original_query[:50]}...'")
+
+        return memory_input, on_stored
+
+    def store_episode(
+        self,
+        original_query: str,
+        planned_searches: List[str],
+        user_decision: str,
+        user_feedback_text: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
     ):
         """Store a rich episode after user review interaction."""
         if not self.is_enabled():
             return
 
         try:
-            from datetime import datetime
-
-            # Analyze query complexity
-            complexity = self._assess_query_complexity(original_query)
-            
-            # Analyze search quality  
-            search_quality = self._assess_search_quality(planned_searches)
-            
-            # Generate decision context
-            decision_context = self._generate_decision_context(
-                original_query, planned_searches, user_decision, user_feedback_text
+            memory_input, on_stored = self._prepare_episode(
+                original_query, planned_searches, user_decision, user_feedback_text, query_embedding
             )
+            self.episode_manager.invoke(memory_input)
+            on_stored()
 
-            # Create rich episode
-            episode = EpisodicReviewMemory(
-                original_query=original_query,
-                planned_searches=planned_searches,
-                user_decision=user_decision,
-                user_feedback_text=user_feedback_text,
-                decision_context=decision_context,
-                query_complexity=complexity,
-                search_quality=search_quality,
-                timestamp=datetime.now().isoformat()
-            )
+        except Exception as e:
+            print(f"📝 Error storing episode: {e}")
 
-            # Store episode using langmem
-            conversation = [{
-                "role": "user", 
-                "content": f"Store this review episode: {episode.get_searchable_content()}"
-            }]
-            
-            if self.episode_manager:
-                self.episode_manager.invoke({"messages": conversation})
-                print(f"📝 Stored episodic memory: {user_decision} for '{original_query[:50]}...'")
+    async def astore_episode(
+        self,
+        original_query: str,
+        planned_searches: List[str],
+        user_decision: str,
+        user_feedback_text: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
+    ):
+        """Async variant of store_episode, suitable for running as a background task."""
+        if not self.is_enabled():
+            return
+
+        try:
+            memory_input, on_stored = self._prepare_episode(
+                original_query, planned_searches, user_decision, user_feedback_text, query_embedding
+            )
+            await self.episode_manager.ainvoke(memory_input)
+            on_stored()
 
         except Exception as e:
             print(f"📝 Error storing episode: {e}")
 
     def _assess_query_complexity(self, query: str) -> Literal["simple", "moderate", "complex"]:
         """Assess complexity of user query."""
-        query_lower = query.lower()
-        
         # Simple patterns
-        if any(word in query_lower for word in ["weather", "time", "what is"]):
+        if _SIMPLE_QUERY_RE.search(query):
             return "simple"
-        
-        # Complex patterns  
-        if any(word in query_lower for word in ["compare", "analyze", "research", "comprehensive"]):
+
+        # Complex patterns
+        if _COMPLEX_QUERY_RE.search(query):
             return "complex"
             
         return "moderate"
@@ -290,15 +476,16 @@ class EpisodicMemoryManager:
             return "broad"
 
     def _generate_decision_context(
-        self, 
-        query: str, 
-        searches: List[str], 
-        decision: str, 
+        self,
+        complexity: str,
+        search_quality: str,
+        search_count: int,
+        decision: str,
         feedback: Optional[str]
     ) -> str:
         """Generate context about why this decision made sense."""
-        context = f"User {decision}ed a {self._assess_query_complexity(query)} query "
-        context += f"with {len(searches)} {self._assess_search_quality(searches)} searches. "
+        context = f"User {decision}ed a {complexity} query "
+        context += f"with {search_count} {search_quality} searches. "
         
         if feedback:
             context += f"Feedback: {feedback}. "
@@ -311,3 +498,29 @@ class EpisodicMemoryManager:
             context += "User provided feedback to improve searches."
             
         return context
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _unit_vector(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
+
+
+@lru_cache(maxsize=256)
+def _memory_manager_for_user(user_id: str) -> EpisodicMemoryManager:
+    return EpisodicMemoryManager({"configurable": {"user_id": user_id}})
+
+
+def get_memory_manager(config: Optional[RunnableConfig] = None) -> EpisodicMemoryManager:
+    """Get the shared memory manager for the config's user, creating it on first use.
+
+    Managers only depend on the user_id namespace, so one instance per user is
+    reused across nodes and turns instead of rebuilding the langmem manager.
+    """
+    user_id = "default_user"
+    if config and "configurable" in config:
+        user_id = config["configurable"].get("user_id", "default_user")
+    return _memory_manager_for_user(user_id)
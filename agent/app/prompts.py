@@ -10,12 +10,8 @@ QUERY_CLASSIFICATION_TEMPLATE = """
 You are an expert query classifier who determines whether queries require web search or can be answered from conversation history.
 </ Role >
 
-< Conversation History >
-{conversation_history}
-</ Conversation History >
-
 < Instructions >
-Analyze the conversation history above and the current user query to determine the appropriate classification:
+Analyze the conversation history and the current user query (the latest user message) to determine the appropriate classification:
 
 1. NEEDS_SEARCH: Choose this if the query requires new information from the web such as:
    - Current facts, events, or data not in the conversation
@@ -27,7 +23,11 @@ Analyze the conversation history above and the current user query to determine t
    - References to "those", "these", or items discussed earlier
    - Summarization or comparison of previously discussed topics
 
-Current User Query: {current_query}
+3. Search Planning (NEEDS_SEARCH only):
+   - Generate up to 3 focused web search queries that gather the information needed to answer the query
+   - If the user refers to "those", "these", or similar references, use the EXACT names from the conversation history
+   - If no specific date/year is mentioned in the query, include current year/month in your searches. The current date in ISO format is: {current_date}.
+   - Use as few queries as possible while ensuring comprehensive coverage
 </ Instructions >
 
 < Examples >
@@ -49,7 +49,13 @@ NEEDS_SEARCH queries:
 - Consider whether the conversation history contains sufficient information
 - If the query references previous discussion items, lean toward DIRECT_ANSWER
 - If the query asks for new factual information, choose NEEDS_SEARCH
-</ Rules >"""
+- Only provide planned queries for NEEDS_SEARCH; use an empty list for DIRECT_ANSWER
+</ Rules >
+
+< Output Format >
+Respond with a JSON object only, using exactly these keys:
+{{"classification": "NEEDS_SEARCH" or "DIRECT_ANSWER", "reasoning": "<brief explanation>", "confidence": <number from 0.0 to 1.0>, "planned_queries": ["<search query>", ...]}}
+</ Output Format >"""
 
 
 # Query planning prompt template
@@ -58,12 +64,8 @@ QUERY_PLANNING_TEMPLATE = """
 You are an expert search query planner who generates targeted web search queries to gather comprehensive information.
 </ Role >
 
-< Conversation History >
-{conversation_history}
-</ Conversation History >
-
 < Instructions >
-Analyze the user's current query in the context of the conversation history above and generate effective search queries:
+Analyze the user's current query (the latest user message) in the context of the conversation history and generate effective search queries:
 
 1. Context Analysis:
    - Review the conversation history to understand what has been discussed
@@ -74,8 +76,6 @@ Analyze the user's current query in the context of the conversation history abov
    - Generate focused search queries that will gather comprehensive information to answer the user's question
    - Use as few queries as possible while ensuring comprehensive coverage
    - Make each search query specific and targeted for best results
-
-Current User Query: {current_query}
 </ Instructions >
 
 < Output Format >
@@ -100,15 +100,11 @@ DIRECT_ANSWER_TEMPLATE = """
 You are a helpful assistant who provides direct answers to user queries.
 </ Role >
 
-< Conversation History >
-{conversation_history}
-</ Conversation History >
-
 < Instructions >
-Analyze the conversation history above and the current user query to determine the best approach:
+Analyze the conversation history and the current user query (the latest user message) to determine the best approach:
 
 1. If there is relevant conversation history:
-   - Answer the user's question using ONLY the information from the conversation history above
+   - Answer the user's question using ONLY the information from the conversation history
    - Be helpful, accurate, and specific
    - If the user refers to "those", "these", or similar references, identify the specific items from the conversation history
    - Do not add any new information that wasn't previously discussed
@@ -117,8 +113,6 @@ Analyze the conversation history above and the current user query to determine t
    - Use your knowledge to provide a helpful, accurate answer
    - Be informative but concise
    - Focus on directly answering what the user asked
-
-Current User Query: {original_query}
 </ Instructions >
 
 < Rules >
@@ -1,5 +1,7 @@
 """Agent execution and streaming functions."""
 
+import threading
+
 from langchain_core.messages import HumanMessage, ToolMessage, AIMessage
 
 from app.agent import create_agent, get_config
@@ -7,17 +9,40 @@ from app.state import AgentState
 
 # Global agent instance to maintain memory across calls
 _global_agent = None
+_global_agent_lock = threading.Lock()
+
+# Per-turn defaults for every scalar state field (lists are created fresh per turn)
+_INITIAL_STATE_DEFAULTS = {
+    "search_count": 0,
+    "original_query": "",
+    "query_embedding": None,
+    "needs_search": False,
+    "user_feedback": "",
+}
+
 
 def get_or_create_agent(use_memory: bool = False):
     """Get existing agent or create new one (for memory persistence)."""
     global _global_agent
     if _global_agent is None:
-        _global_agent = create_agent(use_memory=use_memory)
+        # Double-checked so concurrent first calls from worker threads build one agent
+        with _global_agent_lock:
+            if _global_agent is None:
+                _global_agent = create_agent(use_memory=use_memory)
     return _global_agent
 
 
+async def _print_event(event):
+    """Print a stream event to stdout, for runs without a stream callback."""
+    if event["type"] == "answer":
+        print(event["content"], end="", flush=True)
+    else:
+        print(event["content"])
+
+
 async def run_agent_sse(query: str, thread_id: str, stream_callback=None, use_langgraph_events=False, use_memory: bool = False):
     """Run the agent with SSE streaming support and persistent memory."""
+    stream_callback = stream_callback or _print_event
     agent = get_or_create_agent(use_memory=use_memory)
     config = get_config(thread_id)
     
@@ -25,19 +50,14 @@ async def run_agent_sse(query: str, thread_id: str, stream_callback=None, use_la
     new_message = HumanMessage(content=query)
     
     start_msg = f"🤖 Processing query...\n📝 Query: {query}\n" + "=" * 60
-    if stream_callback:
-        await stream_callback({"type": "start", "content": start_msg})
-    else:
-        print(start_msg)
+    await stream_callback({"type": "start", "content": start_msg})
     
     # Create proper initial state with all required fields
     initial_state: AgentState = {
+        **_INITIAL_STATE_DEFAULTS,
         "messages": [new_message],
-        "search_count": 0,
-        "original_query": "",
         "planned_queries": [],
         "search_results": [],
-        "needs_search": False
     }
     
     if use_langgraph_events:
@@ -45,9 +65,21 @@ async def run_agent_sse(query: str, thread_id: str, stream_callback=None, use_la
         async for event in agent.astream_events(initial_state, config=config, version="v1"):
             await handle_langgraph_event(event, stream_callback)
     else:
-        # Use custom node-based streaming (current implementation)
-        async for event in agent.astream(initial_state, config=config):
-            await handle_custom_event(event, stream_callback)
+        # Use custom node-based streaming, with summary tokens from the "custom" stream
+        answer_streamed = False
+        async for mode, event in agent.astream(
+            initial_state, config=config, stream_mode=["updates", "custom"]
+        ):
+            if mode == "custom":
+                answer_streamed = answer_streamed or event.get("type") == "answer"
+                await handle_stream_token(event, stream_callback)
+            else:
+                await handle_custom_event(event, stream_callback, answer_streamed)
+
+
+async def handle_stream_token(event, stream_callback):
+    """Forward a token written by a node's stream writer."""
+    await stream_callback(event)
 
 
 async def handle_langgraph_event(event, stream_callback):
@@ -58,10 +90,7 @@ async def handle_langgraph_event(event, stream_callback):
         # Stream individual tokens from LLM
         chunk = event.get("data", {}).get("chunk", {})
         if hasattr(chunk, 'content') and chunk.content:
-            if stream_callback:
-                await stream_callback({"type": "answer", "content": str(chunk.content)})
-            else:
-                print(str(chunk.content), end="", flush=True)
+            await stream_callback({"type": "answer", "content": str(chunk.content)})
     
     elif event_type == "on_tool_start":
         # Tool execution start (search)
@@ -69,59 +98,55 @@ async def handle_langgraph_event(event, stream_callback):
         if "search" in tool_name.lower():
             query = event.get("data", {}).get("input", {}).get("query", "")
             search_msg = f"🔍 Searching: '{query}'\n"
-            if stream_callback:
-                await stream_callback({"type": "search", "content": search_msg})
-            else:
-                print(search_msg)
+            await stream_callback({"type": "search", "content": search_msg})
     
     elif event_type == "on_tool_end":
         # Tool execution end
         tool_name = event.get("name", "")
         if "search" in tool_name.lower():
             results_msg = "📊 Search completed\n" + "-" * 40 + "\n"
-            if stream_callback:
-                await stream_callback({"type": "results", "content": results_msg})
-            else:
-                print(results_msg)
+            await stream_callback({"type": "results", "content": results_msg})
     
     elif event_type == "on_chain_start":
         # Node execution start
         node_name = event.get("name", "")
         if node_name == "planning":
             planning_msg = "🧠 Planning search queries...\n"
-            if stream_callback:
-                await stream_callback({"type": "planning", "content": planning_msg})
-            else:
-                print(planning_msg)
+            await stream_callback({"type": "planning", "content": planning_msg})
         elif node_name == "summarize":
             final_msg = "✅ Generating final answer...\n"
-            if stream_callback:
-                await stream_callback({"type": "final", "content": final_msg})
-            else:
-                print(final_msg)
+            await stream_callback({"type": "final", "content": final_msg})
+
+
+async def _emit_search_results(message: ToolMessage, stream_callback, answer_streamed: bool):
+    results_msg = f"📊 Search completed\n" + "-" * 40
+    await stream_callback({"type": "results", "content": results_msg})
+
+
+async def _emit_final_answer(message: AIMessage, stream_callback, answer_streamed: bool):
+    # A streamed answer already reached the callback as tokens; only mark its end
+    final_answer = "" if answer_streamed else f"\n🎯 Final Answer:\n{message.content}\n"
+    await stream_callback({"type": "final_answer", "content": final_answer})
+
+
+# Node updates that produce output, with the last-message type each expects
+_CUSTOM_EVENT_HANDLERS = {
+    "search": (ToolMessage, _emit_search_results),
+    # Auto-approved runs get their search results from the speculative searches here
+    "memory_check": (ToolMessage, _emit_search_results),
+    "summarize": (AIMessage, _emit_final_answer),
+}
 
 
-async def handle_custom_event(event, stream_callback):
+async def handle_custom_event(event, stream_callback, answer_streamed: bool = False):
     """Handle custom node-based events (current implementation)."""
-    # Handle different node types
-    for node_name in ["planning", "search", "summarize"]:
-        if node_name in event:
-            state = event[node_name]
-            if state["messages"]:
-                last_msg = state["messages"][-1]
-                if isinstance(last_msg, ToolMessage) and node_name == "search":
-                    results_msg = f"📊 Search completed\n" + "-" * 40
-                    if stream_callback:
-                        await stream_callback({"type": "results", "content": results_msg})
-                    else:
-                        print(results_msg)
-                elif isinstance(last_msg, AIMessage) and node_name == "summarize":
-                    # This is the final answer
-                    final_answer = f"\n🎯 Final Answer:\n{last_msg.content}\n"
-                    if stream_callback:
-                        await stream_callback({"type": "final_answer", "content": final_answer})
-                    else:
-                        print(final_answer)
+    for node_name in _CUSTOM_EVENT_HANDLERS.keys() & event.keys():
+        state = event[node_name]
+        if state and state.get("messages"):
+            message_type, handler = _CUSTOM_EVENT_HANDLERS[node_name]
+            last_msg = state["messages"][-1]
+            if isinstance(last_msg, message_type):
+                await handler(last_msg, stream_callback, answer_streamed)
 
 
 async def run_agent(query: str, thread_id: str, use_langgraph_events=False, use_memory: bool = False):
@@ -1,6 +1,6 @@
 """Agent state definition."""
 
-from typing import Annotated, List, TypedDict, Dict, Any
+from typing import Annotated, List, Optional, TypedDict, Dict, Any
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
@@ -9,6 +9,7 @@ class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], add_messages]
     search_count: int
     original_query: str
+    query_embedding: Optional[List[float]]
     planned_queries: List[str]
     search_results: List[Dict[str, Any]]
     needs_search: bool
@@ -1,27 +1,57 @@
 """Search tools for the agent."""
 
+import asyncio
 import os
+import weakref
 import aiohttp
 from langchain_core.tools import tool
 
+TAVILY_URL = "https://api.tavily.com/search"
+
+# One pooled session per event loop, so TLS connections to Tavily are reused across calls
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Get the pooled session for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=15),
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_search_session():
+    """Close the pooled session for the running event loop."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
 
 @tool
 async def tavily_search(query: str) -> str:
     """Search the web using Tavily API."""
     api_key = os.getenv("TAVILY_API_KEY")
-    url = "https://api.tavily.com/search"
-    
+
     payload = {
         "api_key": api_key,
         "query": query,
         "search_depth": "basic",
-        "include_answer": True,
+        # Only titles, URLs and snippets are used; skip the heavier optional fields
+        "include_answer": False,
+        "include_raw_content": False,
+        "include_images": False,
         "max_results": 3
     }
     
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=payload) as response:
-            data = await response.json()
+    async with _get_session().post(TAVILY_URL, json=payload) as response:
+        data = await response.json()
     
     results = []
     for result in data.get("results", []):
@@ -1,6 +1,11 @@
 """End-to-end evaluation of research agent using LLM-as-judge following eval_template patterns."""
 
 import asyncio
+import hashlib
+import json
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
@@ -13,11 +18,14 @@ from eval.e2e_tests.research_e2e_dataset import examples_research_e2e
 from eval.utils import (
     get_client,
     create_dataset_if_not_exists,
-    create_evaluation_plots,
-    save_results_plot,
+    save_results,
     format_evaluation_results,
     print_detailed_results,
 )
+from eval.utils.judge_cache import get_cached_verdict, cache_verdict
+from eval.utils.log_queue import configure_eval_logging
+from eval.utils.event_loop import run_evaluation
+from eval.utils.experiment_reuse import source_fingerprint, find_experiment_results
 from app.agent import create_agent, get_config
 from app.state import AgentState
 from eval.e2e_tests.evaluation_prompts import RESEARCH_QUALITY_EVALUATION_PROMPT
@@ -25,10 +33,26 @@ from eval.e2e_tests.evaluation_prompts import RESEARCH_QUALITY_EVALUATION_PROMPT
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Dataset configuration
 DATASET_NAME = "Research Agent: End-to-End Evaluation Dataset"
 DATASET_DESCRIPTION = "End-to-end evaluation dataset for research agent with LLM-as-judge quality assessment."
 
+# Examples are independent and I/O-bound, so run several at once (lower to respect rate limits)
+MAX_CONCURRENCY = int(os.getenv("EVAL_MAX_CONCURRENCY", "8"))
+
+# Misclassified responses shorter than this fail without calling the judge
+MIN_JUDGED_RESPONSE_LENGTH = 200
+
+JUDGE_MODEL = "gpt-4o"
+
+# Files whose changes invalidate a previous experiment (globs relative to agent/)
+E2E_SOURCES = ["app/*.py", "eval/e2e_tests/*.py"]
+
+# Seconds between status checks of an OpenAI batch judge job
+BATCH_POLL_INTERVAL = 30
+
 
 # Structured output schema for LLM-as-judge evaluation
 class ResearchQualityGrade(BaseModel):
@@ -51,9 +75,18 @@ class ResearchQualityGrade(BaseModel):
     )
 
 
-# LLM evaluator with structured output
-evaluator_llm = ChatOpenAI(model="gpt-4o", temperature=0).with_structured_output(
-    ResearchQualityGrade
+@lru_cache(maxsize=None)
+def get_shared_langgraph_client():
+    """LangGraph client shared by all examples so its connection pool is reused."""
+    langgraph_server_url = os.getenv("LANGGRAPH_SERVER_URL")
+    if not langgraph_server_url:
+        raise ValueError("LANGGRAPH_SERVER_URL environment variable not set")
+    return get_langgraph_client(url=langgraph_server_url)
+
+
+# LLM evaluator with native JSON-schema structured output (no function-calling round trip)
+evaluator_llm = ChatOpenAI(model=JUDGE_MODEL, temperature=0).with_structured_output(
+    ResearchQualityGrade, method="json_schema"
 )
 
 
@@ -69,11 +102,7 @@ async def target_research_agent_e2e(inputs: dict) -> dict:
     """
     try:
         # Set up LangGraph client for proper interrupt handling
-        langgraph_server_url = os.getenv("LANGGRAPH_SERVER_URL")
-        if not langgraph_server_url:
-            raise ValueError("LANGGRAPH_SERVER_URL environment variable not set")
-
-        langgraph_client = get_langgraph_client(url=langgraph_server_url)
+        langgraph_client = get_shared_langgraph_client()
 
         # Create a new thread for this evaluation
         thread = await langgraph_client.threads.create()
@@ -97,44 +126,37 @@ async def target_research_agent_e2e(inputs: dict) -> dict:
         initial_input = {"messages": messages}
 
         # Execute workflow with automatic interrupt handling using LangGraph client
-        result_messages = []
         final_result = None
 
-        # Start the initial run
+        # Start the initial run; the updates stream surfaces LangGraph interrupts explicitly
+        interrupted = False
         async for chunk in langgraph_client.runs.stream(
             thread_id=thread_id,
             assistant_id="agent",
             input=initial_input,
-            stream_mode=["values", "events"],
+            stream_mode=["values", "updates"],
         ):
             if chunk.event == "values":
                 final_result = chunk.data
-                if "messages" in chunk.data:
-                    result_messages = chunk.data["messages"]
-
-        # Check if we hit an interrupt by looking for planned queries without completion
-        if (
-            final_result
-            and final_result.get("planned_queries")
-            and not final_result.get("user_feedback")
-        ):
-            print("🔄 Evaluation: Detected interrupt state, auto-approving...")
+            elif chunk.event == "updates" and "__interrupt__" in chunk.data:
+                interrupted = True
+
+        if interrupted:
+            logger.info("🔄 Evaluation: Detected interrupt state, auto-approving...")
 
             # Resume with "approve" using Command
             async for chunk in langgraph_client.runs.stream(
                 thread_id=thread_id,
                 assistant_id="agent",
                 command=Command(resume="approve"),
-                stream_mode=["values", "events"],
+                stream_mode="values",
             ):
                 if chunk.event == "values":
                     final_result = chunk.data
-                    if "messages" in chunk.data:
-                        result_messages = chunk.data["messages"]
 
         # Convert result to expected format
         result = final_result or {
-            "messages": result_messages,
+            "messages": [],
             "search_count": 0,
             "planned_queries": [],
             "search_results": [],
@@ -183,7 +205,7 @@ async def target_research_agent_e2e(inputs: dict) -> dict:
 
     except Exception as e:
         error_msg = f"Agent execution failed: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return {
             "final_response": f"ERROR: {error_msg}",
             "classification_decision": "ERROR",
@@ -193,120 +215,371 @@ async def target_research_agent_e2e(inputs: dict) -> dict:
         }
 
 
-def research_quality_evaluator(outputs: dict, reference_outputs: dict) -> dict:
-    """LLM-as-judge evaluator for research agent response quality.
+def _memoize_target(target):
+    """Wrap an async target so samples with identical inputs share one agent run."""
+    runs = {}
 
-    Args:
-        outputs: Agent's response from target_research_agent_e2e
-        reference_outputs: Expected outputs with success criteria
+    async def memoized(inputs: dict) -> dict:
+        key = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+        if key not in runs:
+            runs[key] = asyncio.ensure_future(target(inputs))
+        return await asyncio.shield(runs[key])
 
-    Returns:
-        Evaluation results with structured feedback
-    """
-    try:
-        # Extract data
-        final_response = outputs["final_response"]
-        actual_classification = outputs.get("classification_decision", "UNKNOWN")
-        expected_classification = reference_outputs["classification"]
-        success_criteria = reference_outputs["success_criteria"]
-
-        # Handle error responses
-        if actual_classification == "ERROR" or final_response.startswith("ERROR:"):
-            return {
-                "key": "research_quality_evaluator",
-                "score": 0.0,
-                "feedback": {
-                    "classification_correct": False,
-                    "criteria_analysis": "Agent execution failed - cannot evaluate criteria",
-                    "overall_quality": 1,
-                    "justification": f"Agent failed to execute properly: {final_response}",
-                    "grade": False,
-                    "error": True,
-                },
-            }
-
-        # Format criteria for evaluation
-        criteria_text = "\n".join(success_criteria)
+    return memoized
 
-        # Create evaluation prompt
-        evaluation_prompt = RESEARCH_QUALITY_EVALUATION_PROMPT.format(
-            expected_classification=expected_classification,
-            actual_classification=actual_classification,
-            criteria_text=criteria_text,
-            final_response=final_response,
-        )
-
-        # Get LLM evaluation
-        eval_result = evaluator_llm.invoke([HumanMessage(content=evaluation_prompt)])
 
-        # Cast to proper type for structured output
-        if isinstance(eval_result, ResearchQualityGrade):
-            grade_result = eval_result
-        else:
-            # Fallback for unexpected response format
-            grade_result = ResearchQualityGrade(
-                classification_correct=False,
-                criteria_analysis="Evaluation failed - unexpected response format",
-                overall_quality=1,
-                grade=False,
-                justification="Error in evaluation processing",
-            )
+def _unjudged_feedback(outputs: dict, reference_outputs: dict) -> Optional[dict]:
+    """Return the evaluation for responses whose grade is decided without the judge."""
+    final_response = outputs["final_response"]
+    actual_classification = outputs.get("classification_decision", "UNKNOWN")
+    expected_classification = reference_outputs["classification"]
 
-        # Return structured evaluation
+    # Handle error responses
+    if actual_classification == "ERROR" or final_response.startswith("ERROR:"):
         return {
             "key": "research_quality_evaluator",
-            "score": 1.0 if grade_result.grade else 0.0,
+            "score": 0.0,
             "feedback": {
-                "classification_correct": bool(grade_result.classification_correct),
-                "criteria_analysis": str(grade_result.criteria_analysis),
-                "overall_quality": int(grade_result.overall_quality),
-                "justification": str(grade_result.justification),
-                "grade": bool(grade_result.grade),
+                "classification_correct": False,
+                "criteria_analysis": "Agent execution failed - cannot evaluate criteria",
+                "overall_quality": 1,
+                "justification": f"Agent failed to execute properly: {final_response}",
+                "grade": False,
+                "error": True,
             },
         }
 
-    except Exception as e:
-        print(f"Error in evaluation: {e}")
+    # The rubric never passes a misclassified response; a short one also
+    # can't earn a meaningful quality score, so skip the judge call
+    if (
+        actual_classification != expected_classification
+        and len(final_response) < MIN_JUDGED_RESPONSE_LENGTH
+    ):
         return {
             "key": "research_quality_evaluator",
             "score": 0.0,
-            "feedback": {"error": str(e)},
+            "feedback": {
+                "classification_correct": False,
+                "criteria_analysis": "Not judged - misclassified response too short to meet criteria",
+                "overall_quality": 1,
+                "justification": (
+                    f"Expected {expected_classification} but got {actual_classification}; "
+                    "grade requires a correct classification"
+                ),
+                "grade": False,
+            },
         }
 
+    return None
 
-async def run_research_e2e_evaluation():
-    """Run the end-to-end research agent evaluation."""
-    print("🚀 Starting end-to-end research agent evaluation...")
 
-    # Setup dataset
-    create_dataset_if_not_exists(
-        DATASET_NAME, DATASET_DESCRIPTION, examples_research_e2e
+def _escape_braces(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+@lru_cache(maxsize=256)
+def _partial_evaluation_prompt(expected_classification: str, criteria_text: str) -> str:
+    """Judge prompt template with the static per-example fields already filled in."""
+    return RESEARCH_QUALITY_EVALUATION_PROMPT.format(
+        expected_classification=_escape_braces(expected_classification),
+        criteria_text=_escape_braces(criteria_text),
+        actual_classification="{actual_classification}",
+        final_response="{final_response}",
     )
 
+
+def _evaluation_prompt(outputs: dict, reference_outputs: dict) -> str:
+    """Format the judge prompt for an agent response."""
+    template = _partial_evaluation_prompt(
+        reference_outputs["classification"], "\n".join(reference_outputs["success_criteria"])
+    )
+    return template.format(
+        actual_classification=outputs.get("classification_decision", "UNKNOWN"),
+        final_response=outputs["final_response"],
+    )
+
+
+def make_research_quality_evaluator(
+    cache_overwrite: bool = False, verdicts: Optional[Dict[str, str]] = None
+):
+    """Build the LLM-as-judge evaluator.
+
+    Args:
+        cache_overwrite: Ignore verdicts cached by earlier runs and refresh them
+        verdicts: Verdict JSON by judge prompt from this run's deferred judging,
+            used ahead of the cache even when overwriting
+    """
+    verdicts = verdicts or {}
+
+    async def research_quality_evaluator(outputs: dict, reference_outputs: dict) -> dict:
+        """LLM-as-judge evaluator for research agent response quality.
+
+        Args:
+            outputs: Agent's response from target_research_agent_e2e
+            reference_outputs: Expected outputs with success criteria
+
+        Returns:
+            Evaluation results with structured feedback
+        """
+        try:
+            unjudged = _unjudged_feedback(outputs, reference_outputs)
+            if unjudged:
+                return unjudged
+
+            # Create evaluation prompt
+            evaluation_prompt = _evaluation_prompt(outputs, reference_outputs)
+
+            # Identical prompts (same criteria and response) reuse the cached verdict
+            cached = verdicts.get(evaluation_prompt) or await asyncio.to_thread(
+                get_cached_verdict, evaluation_prompt, cache_overwrite
+            )
+            if cached:
+                grade_result = ResearchQualityGrade.model_validate_json(cached)
+            else:
+                # Get LLM evaluation
+                eval_result = await evaluator_llm.ainvoke([HumanMessage(content=evaluation_prompt)])
+
+                # Cast to proper type for structured output
+                if isinstance(eval_result, ResearchQualityGrade):
+                    grade_result = eval_result
+                    await asyncio.to_thread(
+                        cache_verdict, evaluation_prompt, grade_result.model_dump_json()
+                    )
+                else:
+                    # Fallback for unexpected response format
+                    grade_result = ResearchQualityGrade(
+                        classification_correct=False,
+                        criteria_analysis="Evaluation failed - unexpected response format",
+                        overall_quality=1,
+                        grade=False,
+                        justification="Error in evaluation processing",
+                    )
+
+            # Return structured evaluation
+            return {
+                "key": "research_quality_evaluator",
+                "score": 1.0 if grade_result.grade else 0.0,
+                "feedback": {
+                    "classification_correct": bool(grade_result.classification_correct),
+                    "criteria_analysis": str(grade_result.criteria_analysis),
+                    "overall_quality": int(grade_result.overall_quality),
+                    "justification": str(grade_result.justification),
+                    "grade": bool(grade_result.grade),
+                },
+            }
+
+        except Exception as e:
+            logger.error("Error in evaluation: %s", e)
+            return {
+                "key": "research_quality_evaluator",
+                "score": 0.0,
+                "feedback": {"error": str(e)},
+            }
+
+    return research_quality_evaluator
+
+
+async def _pending_judge_prompts(experiment_results, cache_overwrite: bool) -> List[str]:
+    """Collect the distinct judge prompts of an experiment that have no usable cached verdict."""
+    prompts = {}
+    async for row in experiment_results:
+        outputs = row["run"].outputs or {}
+        reference_outputs = row["example"].outputs or {}
+        if _unjudged_feedback(outputs, reference_outputs):
+            continue
+        prompt = _evaluation_prompt(outputs, reference_outputs)
+        if await asyncio.to_thread(get_cached_verdict, prompt, cache_overwrite) is None:
+            prompts[prompt] = None
+    return list(prompts)
+
+
+async def judge_with_abatch(prompts: List[str]) -> Dict[str, str]:
+    """Judge prompts concurrently in one evaluator_llm.abatch call and cache the verdicts.
+
+    Args:
+        prompts: Formatted judge prompts
+
+    Returns:
+        Verdict JSON by prompt, for the prompts that were judged
+    """
+    verdicts = await evaluator_llm.abatch(
+        [[HumanMessage(content=prompt)] for prompt in prompts],
+        config={"max_concurrency": MAX_CONCURRENCY},
+        return_exceptions=True,
+    )
+    judged = {}
+    for prompt, verdict in zip(prompts, verdicts):
+        if isinstance(verdict, ResearchQualityGrade):
+            judged[prompt] = verdict.model_dump_json()
+            await asyncio.to_thread(cache_verdict, prompt, judged[prompt])
+        else:
+            # Unjudged samples fall back to individual judge calls
+            logger.error("Error in evaluation: %s", verdict)
+    return judged
+
+
+async def judge_with_batch_api(prompts: List[str]) -> Dict[str, str]:
+    """Judge prompts in one OpenAI Batch API job and cache the verdicts.
+
+    Batch requests cost half as much as individual judge calls.
+
+    Args:
+        prompts: Formatted judge prompts
+    """
+    from openai import AsyncOpenAI
+
+    prompts_by_id = {f"sample-{i}": prompt for i, prompt in enumerate(prompts)}
+
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "ResearchQualityGrade",
+            "schema": ResearchQualityGrade.model_json_schema(),
+        },
+    }
+    requests = "\n".join(
+        json.dumps(
+            {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": JUDGE_MODEL,
+                    "temperature": 0,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "response_format": response_format,
+                },
+            }
+        )
+        for custom_id, prompt in prompts_by_id.items()
+    )
+
+    client = AsyncOpenAI()
+    batch_file = await client.files.create(
+        file=("judge_batch.jsonl", requests.encode()), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"⚖️  Submitted batch judge job {batch.id} with {len(prompts)} requests")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(BATCH_POLL_INTERVAL)
+        batch = await client.batches.retrieve(batch.id)
+
+    judged = {}
+    if batch.status != "completed" or not batch.output_file_id:
+        # Unjudged samples fall back to individual judge calls
+        print(f"⚠️  Batch judge job ended with status {batch.status}")
+        return judged
+
+    output = await client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        try:
+            item = json.loads(line)
+            content = item["response"]["body"]["choices"][0]["message"]["content"]
+            prompt = prompts_by_id[item["custom_id"]]
+            judged[prompt] = ResearchQualityGrade.model_validate_json(content).model_dump_json()
+            await asyncio.to_thread(cache_verdict, prompt, judged[prompt])
+        except Exception as e:
+            print(f"⚠️  Skipping unreadable batch verdict: {e}")
+    return judged
+
+
+async def judge_deferred(experiment_results, judge_mode: str, cache_overwrite: bool) -> Dict[str, str]:
+    """Judge every pending sample of a finished experiment together.
+
+    Args:
+        experiment_results: Results of an experiment run without evaluators
+        judge_mode: "deferred" for evaluator_llm.abatch or "batch" for the OpenAI Batch API
+        cache_overwrite: Re-judge samples that already have a cached verdict
+
+    Returns:
+        Verdict JSON by prompt for the samples judged here
+    """
+    prompts = await _pending_judge_prompts(experiment_results, cache_overwrite)
+    if not prompts:
+        print("⚖️  All verdicts already cached")
+        return {}
+    if judge_mode == "batch":
+        return await judge_with_batch_api(prompts)
+    return await judge_with_abatch(prompts)
+
+
+async def _run_e2e_experiment(judge_mode: str, fingerprint: str, cache_overwrite: bool):
+    """Run and judge a new E2E experiment tagged with the source fingerprint."""
     # Import aevaluate for async support
     from langsmith import aevaluate
+    from langsmith.evaluation import aevaluate_existing
 
     experiment_results = await aevaluate(
-        # Target function that runs complete research workflow
-        target_research_agent_e2e,
+        # Target function that runs complete research workflow, once per unique input
+        _memoize_target(target_research_agent_e2e),
         # Dataset name
         data=DATASET_NAME,
-        # LLM-as-judge evaluator
-        evaluators=[research_quality_evaluator],
+        # LLM-as-judge evaluator (deferred and batch modes judge after all runs finish)
+        evaluators=[make_research_quality_evaluator(cache_overwrite)] if judge_mode == "sync" else [],
         # Experiment name
         experiment_prefix="Research Agent: End-to-End LLM-as-Judge",
         # Concurrency
-        max_concurrency=1,  # Keep low to avoid rate limits
+        max_concurrency=MAX_CONCURRENCY,
         # Metadata
         metadata={
             "evaluation_type": "end_to_end_llm_judge",
             "agent_version": "research_agent_v1",
+            "source_fp": fingerprint,
         },
     )
 
-    # Convert results to pandas for analysis
-    df_results = experiment_results.to_pandas()
-    results = format_evaluation_results(df_results, "research_quality_evaluator")
+    if judge_mode != "sync":
+        # The evaluator reads this run's verdicts (or cached ones), so scoring the
+        # experiment makes no judge calls, even when overwriting the cache
+        verdicts = await judge_deferred(experiment_results, judge_mode, cache_overwrite)
+        experiment_results = await aevaluate_existing(
+            experiment_results.experiment_name,
+            evaluators=[make_research_quality_evaluator(cache_overwrite, verdicts)],
+            max_concurrency=MAX_CONCURRENCY,
+        )
+
+    # pandas work runs off the event loop so a concurrent evaluation keeps progressing;
+    # plotting stays on the loop because pyplot state is not thread-safe
+    return await asyncio.to_thread(experiment_results.to_pandas)
+
+
+async def run_research_e2e_evaluation(
+    judge_mode: str = "sync", force_rerun: bool = False, cache_overwrite: bool = False
+):
+    """Run the end-to-end research agent evaluation.
+
+    Args:
+        judge_mode: "sync" judges each sample as it completes. "deferred" and "batch"
+            run every sample first, then judge them together via evaluator_llm.abatch
+            or one OpenAI Batch API job
+        force_rerun: Run a new experiment even if one exists for the current sources
+        cache_overwrite: Ignore cached judge verdicts and refresh them
+    """
+    print("🚀 Starting end-to-end research agent evaluation...")
+
+    # Setup dataset
+    create_dataset_if_not_exists(
+        DATASET_NAME, DATASET_DESCRIPTION, examples_research_e2e
+    )
+
+    fingerprint = source_fingerprint(E2E_SOURCES, JUDGE_MODEL)
+    df_results = None
+    if not force_rerun:
+        df_results = await asyncio.to_thread(
+            find_experiment_results, DATASET_NAME, fingerprint, "research_quality_evaluator"
+        )
+
+    if df_results is None:
+        df_results = await _run_e2e_experiment(judge_mode, fingerprint, cache_overwrite)
+
+    results = await asyncio.to_thread(
+        format_evaluation_results, df_results, "research_quality_evaluator"
+    )
 
     print("\n📊 E2E Evaluation Results:")
     print(f"Overall Quality Score: {results['overall_score']:.2f}")
@@ -321,9 +594,8 @@ async def run_research_e2e_evaluation():
         "Research Quality": results["overall_score"],
         "Classification Accuracy": results["classification_accuracy"],
     }
-    create_evaluation_plots(scores, "End-to-End Research Agent Performance")
-    plot_path = save_results_plot("research_e2e")
-    print(f"\n📈 Evaluation visualization saved to: {plot_path}")
+    report_path = save_results("research_e2e", scores, "End-to-End Research Agent Performance", results)
+    print(f"\n📈 Evaluation results saved to: {report_path}")
 
     # Print detailed results
     print_detailed_results(df_results, "research_quality_evaluator")
@@ -334,4 +606,5 @@ async def run_research_e2e_evaluation():
 
 # Run the evaluation
 if __name__ == "__main__":
-    asyncio.run(run_research_e2e_evaluation())
+    configure_eval_logging()
+    run_evaluation(run_research_e2e_evaluation())
@@ -5,17 +5,23 @@ import sys
 from typing import Dict, Any
 from datetime import datetime
 
-# Add parent directory to path for imports
-sys.path.append('.')
-
 from eval.unit_tests.evaluate_classification import run_classification_evaluation
 from eval.e2e_tests.evaluate_research_e2e import run_research_e2e_evaluation
-from eval.utils.visualization import create_comparison_plot, save_results_plot
+from eval.utils.visualization import save_results, set_plots_enabled
 from eval.utils.evaluation_helpers import compare_evaluation_runs
+from eval.utils.log_queue import configure_eval_logging
+from eval.utils.event_loop import run_evaluation
 
-async def run_all_evaluations() -> Dict[str, Any]:
+async def run_all_evaluations(
+    judge_mode: str = "sync", force_rerun: bool = False, cache_overwrite: bool = False
+) -> Dict[str, Any]:
     """Run all evaluation tests and generate comparison report.
     
+    Args:
+        judge_mode: E2E judge mode ('sync', 'deferred', or 'batch')
+        force_rerun: Rerun experiments even when sources are unchanged since the last run
+        cache_overwrite: Ignore cached E2E judge verdicts and refresh them
+        
     Returns:
         Dictionary with results from all evaluations
     """
@@ -26,23 +32,26 @@ async def run_all_evaluations() -> Dict[str, Any]:
     results = {}
     
     try:
-        # Run unit tests
-        print("\n📋 PHASE 1: Unit Tests")
-        print("-" * 40)
-        
-        print("Running classification node evaluation...")
-        classification_results = await run_classification_evaluation()
-        results["classification"] = classification_results
-        
-        print("\n" + "=" * 40)
-        
-        # Run E2E tests
-        print("\n🔄 PHASE 2: End-to-End Tests")
+        # Unit and E2E tests use independent datasets, so run them concurrently
+        print("\n📋 PHASE 1: Unit Tests + 🔄 PHASE 2: End-to-End Tests (concurrent)")
         print("-" * 40)
         
-        print("Running complete workflow evaluation...")
-        e2e_results = await run_research_e2e_evaluation()
-        results["e2e"] = e2e_results
+        print("Running classification node evaluation and complete workflow evaluation...")
+        # Let both finish even if one fails, so a failure doesn't orphan the other run
+        outcomes = await asyncio.gather(
+            run_classification_evaluation(force_rerun),
+            run_research_e2e_evaluation(judge_mode, force_rerun, cache_overwrite),
+            return_exceptions=True,
+        )
+        failures = []
+        for name, outcome in zip(("classification", "e2e"), outcomes):
+            if isinstance(outcome, Exception):
+                print(f"❌ {name} evaluation failed: {outcome}")
+                failures.append(outcome)
+            else:
+                results[name] = outcome
+        if failures:
+            raise failures[0]
         
         print("\n" + "=" * 40)
         
@@ -98,7 +107,7 @@ def generate_comprehensive_report(results: Dict[str, Any]) -> None:
     else:
         print("❌ POOR - Agent requires major fixes")
     
-    # Create comparison visualization
+    # Save comparison chart or report
     try:
         metrics = {
             "Classification\nAccuracy": classification_accuracy,
@@ -106,13 +115,13 @@ def generate_comprehensive_report(results: Dict[str, Any]) -> None:
             "E2E Classification\nAccuracy": e2e_classification_acc
         }
         
-        from eval.utils.visualization import create_evaluation_plots
-        create_evaluation_plots(metrics, "Research Agent: Comprehensive Evaluation Results")
-        plot_path = save_results_plot("comprehensive_evaluation")
-        print(f"\n📈 Comprehensive evaluation chart saved to: {plot_path}")
+        report_path = save_results(
+            "comprehensive_evaluation", metrics, "Research Agent: Comprehensive Evaluation Results", results
+        )
+        print(f"\n📈 Comprehensive evaluation results saved to: {report_path}")
         
     except Exception as e:
-        print(f"⚠️  Could not generate visualization: {e}")
+        print(f"⚠️  Could not save evaluation results: {e}")
     
     # Detailed breakdown
     print(f"\n🔍 DETAILED BREAKDOWN")
@@ -150,21 +159,29 @@ def generate_comprehensive_report(results: Dict[str, Any]) -> None:
     
     print()
 
-async def run_specific_evaluation(eval_type: str) -> Dict[str, Any]:
+async def run_specific_evaluation(
+    eval_type: str,
+    judge_mode: str = "sync",
+    force_rerun: bool = False,
+    cache_overwrite: bool = False,
+) -> Dict[str, Any]:
     """Run a specific evaluation type.
     
     Args:
         eval_type: Type of evaluation ('classification', 'e2e', or 'all')
+        judge_mode: E2E judge mode ('sync', 'deferred', or 'batch')
+        force_rerun: Rerun experiments even when sources are unchanged since the last run
+        cache_overwrite: Ignore cached E2E judge verdicts and refresh them
         
     Returns:
         Results from the specified evaluation
     """
     if eval_type == "classification":
-        return await run_classification_evaluation()
+        return await run_classification_evaluation(force_rerun)
     elif eval_type == "e2e":
-        return await run_research_e2e_evaluation()
+        return await run_research_e2e_evaluation(judge_mode, force_rerun, cache_overwrite)
     elif eval_type == "all":
-        return await run_all_evaluations()
+        return await run_all_evaluations(judge_mode, force_rerun, cache_overwrite)
     else:
         raise ValueError(f"Unknown evaluation type: {eval_type}")
 
@@ -178,11 +195,37 @@ if __name__ == "__main__":
         default="all",
         help="Type of evaluation to run"
     )
+    parser.add_argument(
+        "--judge-mode",
+        choices=["sync", "deferred", "batch"],
+        default="sync",
+        help="Judge E2E samples as they finish, together after all runs, or in one OpenAI Batch API job"
+    )
+    parser.add_argument(
+        "--cache-overwrite",
+        action="store_true",
+        help="Ignore cached judge verdicts and refresh them"
+    )
+    parser.add_argument(
+        "--plots",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Save PNG charts instead of JSON reports"
+    )
+    parser.add_argument(
+        "--force-rerun",
+        action="store_true",
+        help="Run new experiments even if LangSmith has one for the current sources"
+    )
     
     args = parser.parse_args()
+    set_plots_enabled(args.plots)
+    configure_eval_logging()
     
     try:
-        results = asyncio.run(run_specific_evaluation(args.type))
+        results = run_evaluation(run_specific_evaluation(
+            args.type, args.judge_mode, args.force_rerun, args.cache_overwrite
+        ))
         print(f"\n✅ Evaluation completed. Results available in LangSmith dashboard.")
     except KeyboardInterrupt:
         print(f"\n⚠️  Evaluation interrupted by user")
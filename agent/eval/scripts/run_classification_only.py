@@ -1,17 +1,16 @@
 """Run only the classification node evaluation."""
 
-import asyncio
 import sys
 
-# Add parent directory to path for imports
-sys.path.append('.')
-
+from eval.utils.log_queue import configure_eval_logging
+from eval.utils.event_loop import run_evaluation
 from eval.unit_tests.evaluate_classification import run_classification_evaluation
 
 if __name__ == "__main__":
+    configure_eval_logging()
     try:
         print("🎯 Running classification node evaluation only...")
-        results = asyncio.run(run_classification_evaluation())
+        results = run_evaluation(run_classification_evaluation())
         print(f"\n✅ Classification evaluation completed!")
         print(f"📊 Accuracy: {results['overall_score']:.2f}")
         print(f"🎯 Correct: {results['classification_correct']}/{results['total_evaluations']}")
@@ -1,17 +1,16 @@
 """Run only the end-to-end evaluation."""
 
-import asyncio
 import sys
 
-# Add parent directory to path for imports
-sys.path.append('.')
-
+from eval.utils.log_queue import configure_eval_logging
+from eval.utils.event_loop import run_evaluation
 from eval.e2e_tests.evaluate_research_e2e import run_research_e2e_evaluation
 
 if __name__ == "__main__":
+    configure_eval_logging()
     try:
         print("🔄 Running end-to-end evaluation only...")
-        results = asyncio.run(run_research_e2e_evaluation())
+        results = run_evaluation(run_research_e2e_evaluation())
         print(f"\n✅ E2E evaluation completed!")
         print(f"📊 Quality Score: {results['overall_score']:.2f}")
         print(f"🎯 Classification Accuracy: {results['classification_accuracy']:.2f}")
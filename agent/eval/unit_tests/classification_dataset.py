@@ -46,90 +46,6 @@ classification_output_18 = "DIRECT_ANSWER"
 classification_output_19 = "DIRECT_ANSWER"
 classification_output_20 = "DIRECT_ANSWER"
 
-# Dataset examples following eval_template pattern
-examples_classification = [
-    {
-        "inputs": {"query": query_input_1},
-        "outputs": {"classification": classification_output_1},
-    },
-    {
-        "inputs": {"query": query_input_2},
-        "outputs": {"classification": classification_output_2},
-    },
-    {
-        "inputs": {"query": query_input_3},
-        "outputs": {"classification": classification_output_3},
-    },
-    {
-        "inputs": {"query": query_input_4},
-        "outputs": {"classification": classification_output_4},
-    },
-    {
-        "inputs": {"query": query_input_5},
-        "outputs": {"classification": classification_output_5},
-    },
-    {
-        "inputs": {"query": query_input_6},
-        "outputs": {"classification": classification_output_6},
-    },
-    {
-        "inputs": {"query": query_input_7},
-        "outputs": {"classification": classification_output_7},
-    },
-    {
-        "inputs": {"query": query_input_8},
-        "outputs": {"classification": classification_output_8},
-    },
-    {
-        "inputs": {"query": query_input_9},
-        "outputs": {"classification": classification_output_9},
-    },
-    {
-        "inputs": {"query": query_input_10},
-        "outputs": {"classification": classification_output_10},
-    },
-    {
-        "inputs": {"query": query_input_11},
-        "outputs": {"classification": classification_output_11},
-    },
-    {
-        "inputs": {"query": query_input_12},
-        "outputs": {"classification": classification_output_12},
-    },
-    {
-        "inputs": {"query": query_input_13},
-        "outputs": {"classification": classification_output_13},
-    },
-    {
-        "inputs": {"query": query_input_14},
-        "outputs": {"classification": classification_output_14},
-    },
-    {
-        "inputs": {"query": query_input_15},
-        "outputs": {"classification": classification_output_15},
-    },
-    {
-        "inputs": {"query": query_input_16},
-        "outputs": {"classification": classification_output_16},
-    },
-    {
-        "inputs": {"query": query_input_17},
-        "outputs": {"classification": classification_output_17},
-    },
-    {
-        "inputs": {"query": query_input_18},
-        "outputs": {"classification": classification_output_18},
-    },
-    {
-        "inputs": {"query": query_input_19},
-        "outputs": {"classification": classification_output_19},
-    },
-    {
-        "inputs": {"query": query_input_20},
-        "outputs": {"classification": classification_output_20},
-    },
-]
-
 # Helper lists for convenience
 query_inputs = [
     query_input_1, query_input_2, query_input_3, query_input_4, query_input_5,
@@ -143,4 +59,12 @@ classification_outputs = [
     classification_output_6, classification_output_7, classification_output_8, classification_output_9, classification_output_10,
     classification_output_11, classification_output_12, classification_output_13, classification_output_14, classification_output_15,
     classification_output_16, classification_output_17, classification_output_18, classification_output_19, classification_output_20
-]
\ No newline at end of file
+]
+
+# Dataset examples following eval_template pattern, built from the lists above.
+# A tuple keeps the collection read-only; the examples stay plain dicts so they
+# serialize as JSON when uploaded to LangSmith
+examples_classification = tuple(
+    {"inputs": {"query": query}, "outputs": {"classification": classification}}
+    for query, classification in zip(query_inputs, classification_outputs)
+)
@@ -1,14 +1,17 @@
 """Unit test evaluation for query classification node."""
 
+import asyncio
+import os
 from langsmith import Client
 from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage
 
 from .classification_dataset import examples_classification
 from eval.utils import (
-    get_client, create_dataset_if_not_exists, create_evaluation_plots, 
-    save_results_plot, format_evaluation_results, print_detailed_results
+    get_client, create_dataset_if_not_exists, save_results,
+    format_evaluation_results, print_detailed_results
 )
+from eval.utils.experiment_reuse import source_fingerprint, find_experiment_results
 from app.agent import classification
 from app.state import AgentState
 
@@ -19,7 +22,21 @@ load_dotenv()
 DATASET_NAME = "Research Agent: Query Classification Dataset"
 DATASET_DESCRIPTION = "A dataset of queries and their classification decisions (NEEDS_SEARCH vs DIRECT_ANSWER)."
 
-def target_classification_node(inputs: dict) -> dict:
+# Files whose changes invalidate a previous experiment (globs relative to agent/)
+CLASSIFICATION_SOURCES = ["app/*.py", "eval/unit_tests/*.py"]
+
+# Classification is a single LLM call per row, so every row can be in flight at once
+MAX_CONCURRENCY = min(len(examples_classification), int(os.getenv("EVAL_MAX_CONCURRENCY", "20")))
+
+# Scalar AgentState fields shared by every row; list fields are built per call
+_STATE_DEFAULTS = {
+    "search_count": 0,
+    "original_query": "",
+    "needs_search": False,
+    "user_feedback": ""
+}
+
+async def target_classification_node(inputs: dict) -> dict:
     """Process a query through the real classification node from agent.py.
     
     Args:
@@ -31,23 +48,20 @@ def target_classification_node(inputs: dict) -> dict:
     try:
         # Create AgentState with the query as a HumanMessage
         state: AgentState = {
+            **_STATE_DEFAULTS,
             "messages": [HumanMessage(content=inputs["query"])],
-            "search_count": 0,
-            "original_query": "",
             "planned_queries": [],
             "search_results": [],
-            "needs_search": False,
-            "user_feedback": ""
         }
         
         # Run the actual classification node from agent.py
-        result = classification(state)
+        result = await classification(state)
         
         # Extract classification from the Command result
         if hasattr(result, 'update') and result.update and 'needs_search' in result.update:
             needs_search = result.update['needs_search']
-            classification = "NEEDS_SEARCH" if needs_search else "DIRECT_ANSWER"
-            return {"classification_decision": classification}
+            decision = "NEEDS_SEARCH" if needs_search else "DIRECT_ANSWER"
+            return {"classification_decision": decision}
         else:
             print("No needs_search found in classification result")
             return {"classification_decision": "UNKNOWN"}
@@ -60,33 +74,49 @@ def classification_evaluator(outputs: dict, reference_outputs: dict) -> dict:
     is_correct = outputs["classification_decision"] == reference_outputs["classification"]
     return {"key": "classification_evaluator", "score": 1.0 if is_correct else 0.0}
 
-async def run_classification_evaluation():
-    """Run the classification node evaluation."""
+async def run_classification_evaluation(force_rerun: bool = False):
+    """Run the classification node evaluation.
+    
+    Args:
+        force_rerun: Run a new experiment even if one exists for the current sources
+    """
     print("🚀 Starting classification node evaluation...")
     
     # Setup dataset
     client = get_client()
     create_dataset_if_not_exists(DATASET_NAME, DATASET_DESCRIPTION, examples_classification)
     
-    # Import aevaluate for async support
-    from langsmith import aevaluate
+    fingerprint = source_fingerprint(CLASSIFICATION_SOURCES)
+    df_results = None
+    if not force_rerun:
+        df_results = await asyncio.to_thread(
+            find_experiment_results, DATASET_NAME, fingerprint, "classification_evaluator"
+        )
     
-    # Run evaluation
-    experiment_results = await aevaluate(
-        target_classification_node,
-        data=DATASET_NAME,
-        evaluators=[classification_evaluator],
-        experiment_prefix="Research Agent: Query Classification",
-        max_concurrency=2,
-        metadata={
-            "evaluation_type": "unit_test_classification",
-            "node": "classification"
-        }
-    )
+    if df_results is None:
+        # Import aevaluate for async support
+        from langsmith import aevaluate
+        
+        # Run evaluation
+        experiment_results = await aevaluate(
+            target_classification_node,
+            data=DATASET_NAME,
+            evaluators=[classification_evaluator],
+            experiment_prefix="Research Agent: Query Classification",
+            max_concurrency=MAX_CONCURRENCY,
+            metadata={
+                "evaluation_type": "unit_test_classification",
+                "node": "classification",
+                "source_fp": fingerprint
+            }
+        )
+        # pandas work runs off the event loop so a concurrent evaluation keeps progressing
+        df_results = await asyncio.to_thread(experiment_results.to_pandas)
     
     # Process results
-    df_results = experiment_results.to_pandas()
-    results = format_evaluation_results(df_results, "classification_evaluator")
+    results = await asyncio.to_thread(
+        format_evaluation_results, df_results, "classification_evaluator"
+    )
     
     print(f"\n📊 Classification Evaluation Results:")
     print(f"Overall Accuracy: {results['overall_score']:.2f}")
@@ -95,9 +125,8 @@ async def run_classification_evaluation():
     
     # Create visualization
     scores = {"Classification Accuracy": results['overall_score']}
-    create_evaluation_plots(scores, "Query Classification Node Performance")
-    plot_path = save_results_plot("classification")
-    print(f"\n📈 Visualization saved to: {plot_path}")
+    report_path = save_results("classification", scores, "Query Classification Node Performance", results)
+    print(f"\n📈 Results saved to: {report_path}")
     
     # Print detailed results
     print_detailed_results(df_results, "classification_evaluator")
@@ -107,5 +136,5 @@ async def run_classification_evaluation():
 
 # Run evaluation if called directly
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(run_classification_evaluation())
\ No newline at end of file
+    from eval.utils.event_loop import run_evaluation
+    run_evaluation(run_classification_evaluation())
\ No newline at end of file
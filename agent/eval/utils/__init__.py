@@ -1,7 +1,7 @@
 """Shared utilities for evaluation framework."""
 
 from .langsmith_client import get_client, create_dataset_if_not_exists
-from .visualization import create_evaluation_plots, save_results_plot
+from .visualization import create_evaluation_plots, save_results_plot, save_results, set_plots_enabled
 from .evaluation_helpers import format_evaluation_results, print_detailed_results
 
 __all__ = [
@@ -9,6 +9,8 @@ __all__ = [
     "create_dataset_if_not_exists", 
     "create_evaluation_plots",
     "save_results_plot",
+    "save_results",
+    "set_plots_enabled",
     "format_evaluation_results",
     "print_detailed_results"
 ]
\ No newline at end of file
@@ -1,8 +1,15 @@
 """Helper functions for evaluation processing and reporting."""
 
+import numpy as np
 import pandas as pd
+from statistics import NormalDist
 from typing import Dict, Any, List
 
+try:
+    from scipy.stats import t as _t_dist
+except ImportError:  # scipy is optional; fall back to the normal approximation
+    _t_dist = None
+
 def format_evaluation_results(df_results: pd.DataFrame, evaluator_key: str) -> Dict[str, Any]:
     """Format evaluation results from pandas DataFrame.
     
@@ -25,30 +32,27 @@ def format_evaluation_results(df_results: pd.DataFrame, evaluator_key: str) -> D
     overall_score = df_results[feedback_col].mean()
     total_evaluations = len(df_results)
     
-    # Count classification accuracy if available
-    classification_correct = 0
-    for _, row in df_results.iterrows():
-        feedback = row.get(feedback_col, {})
-        if isinstance(feedback, dict) and feedback.get('classification_correct', False):
-            classification_correct += 1
+    # Expand the dict feedback into columns once instead of iterating rows
+    feedback = df_results[feedback_col]
+    feedback = feedback[feedback.map(lambda value: isinstance(value, dict))]
+    fb = pd.json_normalize(feedback.tolist())
+    
+    def truthy_count(field: str) -> int:
+        if field not in fb:
+            return 0
+        return int(fb[field].where(fb[field].notna(), False).astype(bool).sum())
     
+    classification_correct = truthy_count('classification_correct')
     classification_accuracy = classification_correct / total_evaluations if total_evaluations > 0 else 0.0
     
     # Grade distribution
-    grades = {"pass": 0, "fail": 0}
-    quality_scores = []
+    passed = truthy_count('grade')
+    grades = {"pass": passed, "fail": len(fb) - passed}
     
-    for _, row in df_results.iterrows():
-        feedback = row.get(feedback_col, {})
-        if isinstance(feedback, dict):
-            if feedback.get('grade', False):
-                grades["pass"] += 1
-            else:
-                grades["fail"] += 1
-            
-            quality = feedback.get('overall_quality', 0)
-            if quality > 0:
-                quality_scores.append(quality)
+    quality_scores = []
+    if 'overall_quality' in fb:
+        quality = pd.to_numeric(fb['overall_quality'], errors='coerce')
+        quality_scores = quality[quality > 0].tolist()
     
     return {
         "overall_score": float(overall_score),
@@ -70,32 +74,37 @@ def print_detailed_results(df_results: pd.DataFrame, evaluator_key: str) -> None
     """
     feedback_col = f'feedback.{evaluator_key}'
     
-    print("\n🔍 Detailed Results by Test Case:")
-    
-    for idx, row in df_results.iterrows():
-        feedback = row.get(feedback_col, {})
-        if isinstance(feedback, dict):
-            query = row.get('inputs.query', 'Unknown query')
-            if isinstance(query, str) and len(query) > 50:
-                query = query[:50] + "..."
-            
-            grade = feedback.get('grade', False)
-            quality = feedback.get('overall_quality', 0)
-            classification_correct = feedback.get('classification_correct', False)
-            
-            print(f"  {int(idx)+1}. {query}")
-            print(f"     Grade: {'✅ PASS' if grade else '❌ FAIL'} | Quality: {quality}/5 | Classification: {'✅' if classification_correct else '❌'}")
-            
-            justification = feedback.get('justification', '')
-            if justification and isinstance(justification, str):
-                print(f"     {justification[:150]}...")
-            
-            # Show criteria analysis if available
-            criteria_analysis = feedback.get('criteria_analysis', '')
-            if criteria_analysis and isinstance(criteria_analysis, str):
-                print(f"     Analysis: {criteria_analysis[:100]}...")
-            
-            print()
+    lines = ["\n🔍 Detailed Results by Test Case:"]
+    
+    # Plain lists avoid building a Series per row
+    feedbacks = df_results[feedback_col].tolist() if feedback_col in df_results else []
+    queries = df_results['inputs.query'].tolist() if 'inputs.query' in df_results else ['Unknown query'] * len(df_results)
+    
+    for idx, feedback, query in zip(df_results.index, feedbacks, queries):
+        if not isinstance(feedback, dict):
+            continue
+        if isinstance(query, str) and len(query) > 50:
+            query = query[:50] + "..."
+        
+        grade = feedback.get('grade', False)
+        quality = feedback.get('overall_quality', 0)
+        classification_correct = feedback.get('classification_correct', False)
+        
+        lines.append(f"  {int(idx)+1}. {query}")
+        lines.append(f"     Grade: {'✅ PASS' if grade else '❌ FAIL'} | Quality: {quality}/5 | Classification: {'✅' if classification_correct else '❌'}")
+        
+        justification = feedback.get('justification', '')
+        if justification and isinstance(justification, str):
+            lines.append(f"     {justification[:150]}...")
+        
+        # Show criteria analysis if available
+        criteria_analysis = feedback.get('criteria_analysis', '')
+        if criteria_analysis and isinstance(criteria_analysis, str):
+            lines.append(f"     Analysis: {criteria_analysis[:100]}...")
+        
+        lines.append("")
+    
+    print("\n".join(lines))
 
 def calculate_confidence_interval(scores: List[float], confidence: float = 0.95) -> Dict[str, float]:
     """Calculate confidence interval for evaluation scores.
@@ -107,20 +116,27 @@ def calculate_confidence_interval(scores: List[float], confidence: float = 0.95)
     Returns:
         Dictionary with mean, lower_bound, upper_bound
     """
-    import numpy as np
-    from scipy import stats
-    
     if not scores:
         return {"mean": 0.0, "lower_bound": 0.0, "upper_bound": 0.0}
     
-    mean = np.mean(scores)
-    std_err = stats.sem(scores)
-    h = std_err * stats.t.ppv((1 + confidence) / 2., len(scores) - 1)
+    values = np.asarray(scores, dtype=float)
+    mean = float(values.mean())
+    if len(values) < 2:
+        return {"mean": mean, "lower_bound": mean, "upper_bound": mean}
+    
+    std_err = float(values.std(ddof=1) / np.sqrt(len(values)))
+    quantile = (1 + confidence) / 2.
+    # The t distribution is indistinguishable from the normal one for large samples
+    if len(values) >= 30 or _t_dist is None:
+        critical = NormalDist().inv_cdf(quantile)
+    else:
+        critical = float(_t_dist.ppf(quantile, len(values) - 1))
+    h = std_err * critical
     
     return {
-        "mean": float(mean),
-        "lower_bound": float(mean - h),
-        "upper_bound": float(mean + h)
+        "mean": mean,
+        "lower_bound": mean - h,
+        "upper_bound": mean + h
     }
 
 def compare_evaluation_runs(results_list: List[Dict[str, Any]], metric_names: List[str]) -> pd.DataFrame:
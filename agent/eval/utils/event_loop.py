@@ -0,0 +1,20 @@
+"""Event loop selection for evaluation runs."""
+
+import asyncio
+from typing import Any, Coroutine
+
+
+def run_evaluation(coro: Coroutine) -> Any:
+    """Run an evaluation coroutine, on uvloop when it is installed.
+
+    Args:
+        coro: Top-level evaluation coroutine
+
+    Returns:
+        The coroutine's result
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
@@ -0,0 +1,56 @@
+"""Reuse prior LangSmith experiments when the evaluated sources have not changed."""
+
+import hashlib
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from .langsmith_client import get_client
+
+AGENT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def source_fingerprint(patterns: Iterable[str], *extra: str) -> str:
+    """SHA-256 over the matching source files (globs relative to agent/) and extra values.
+
+    Args:
+        patterns: Glob patterns such as "app/*.py"
+        extra: Additional values that affect results, e.g. the judge model
+
+    Returns:
+        Hex digest stored as the experiment's "source_fp" metadata
+    """
+    digest = hashlib.sha256()
+    for pattern in patterns:
+        for path in sorted(AGENT_ROOT.glob(pattern)):
+            digest.update(path.relative_to(AGENT_ROOT).as_posix().encode())
+            digest.update(path.read_bytes())
+    for value in extra:
+        digest.update(value.encode())
+    return digest.hexdigest()
+
+
+def find_experiment_results(
+    dataset_name: str, fingerprint: str, evaluator_key: str
+) -> Optional[pd.DataFrame]:
+    """Load results of a finished experiment on the dataset with the same fingerprint.
+
+    Args:
+        dataset_name: LangSmith dataset the experiment ran against
+        fingerprint: Value of source_fingerprint for the current tree
+        evaluator_key: Feedback key the experiment must have been scored with
+
+    Returns:
+        Results DataFrame, or None if no complete experiment matches
+    """
+    client = get_client()
+    for project in client.list_projects(
+        reference_dataset_name=dataset_name, metadata={"source_fp": fingerprint}
+    ):
+        df_results = client.get_test_results(project_name=project.name)
+        # Runs interrupted before judging have no feedback and must be redone
+        if f"feedback.{evaluator_key}" in df_results.columns:
+            print(f"♻️  Sources unchanged, reusing experiment: {project.name}")
+            return df_results
+    return None
@@ -0,0 +1,62 @@
+"""Persistent cache of LLM-as-judge verdicts keyed by the SHA-256 of the judge prompt."""
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "judge.db"
+
+# Serializes use of the shared connection across asyncio.to_thread workers
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _connect() -> sqlite3.Connection:
+    """Open the cache database once per process."""
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS verdicts (hash TEXT PRIMARY KEY, verdict_json TEXT, date TEXT)"
+    )
+    return conn
+
+
+def _prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode()).hexdigest()
+
+
+def get_cached_verdict(prompt: str, overwrite: bool = False) -> Optional[str]:
+    """Return the cached verdict JSON for a judge prompt, if any.
+
+    Args:
+        prompt: Fully formatted judge prompt
+        overwrite: Ignore the stored verdict so the caller judges afresh and refreshes it
+
+    Returns:
+        Verdict JSON string, or None on a miss or when overwriting
+    """
+    if overwrite:
+        return None
+    with _lock:
+        row = _connect().execute(
+            "SELECT verdict_json FROM verdicts WHERE hash = ?", (_prompt_hash(prompt),)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def cache_verdict(prompt: str, verdict_json: str) -> None:
+    """Store the verdict JSON for a judge prompt.
+
+    Args:
+        prompt: Fully formatted judge prompt
+        verdict_json: Serialized judge verdict
+    """
+    with _lock, _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?)",
+            (_prompt_hash(prompt), verdict_json, datetime.now().isoformat()),
+        )
@@ -1,18 +1,33 @@
 """LangSmith client utilities for evaluation framework."""
 
+import hashlib
+import json
 import os
+from functools import lru_cache
 from langsmith import Client
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Examples per create_examples request, to stay under the API payload limit
+EXAMPLE_BATCH_SIZE = 100
+
+@lru_cache(maxsize=1)
 def get_client() -> Client:
-    """Get configured LangSmith client."""
+    """Get the configured LangSmith client, shared across the process."""
     return Client()
 
+def _inputs_key(inputs: dict) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+def _create_examples_batched(client: Client, dataset_id, examples: list) -> None:
+    """Create examples in as few requests as the API payload limit allows."""
+    for start in range(0, len(examples), EXAMPLE_BATCH_SIZE):
+        client.create_examples(dataset_id=dataset_id, examples=examples[start:start + EXAMPLE_BATCH_SIZE])
+
 def create_dataset_if_not_exists(dataset_name: str, description: str, examples: list) -> None:
-    """Create LangSmith dataset if it doesn't exist.
+    """Create LangSmith dataset if it doesn't exist, or add any examples it is missing.
     
     Args:
         dataset_name: Name of the dataset
@@ -26,7 +41,17 @@ def create_dataset_if_not_exists(dataset_name: str, description: str, examples:
             dataset_name=dataset_name,
             description=description
         )
-        client.create_examples(dataset_id=dataset.id, examples=examples)
+        _create_examples_batched(client, dataset.id, examples)
         print(f"✅ Created dataset: {dataset_name}")
-    else:
-        print(f"📁 Using existing dataset: {dataset_name}")
\ No newline at end of file
+        return
+    
+    # Existing examples are matched by their inputs so reruns never duplicate rows
+    existing = {_inputs_key(example.inputs) for example in client.list_examples(dataset_name=dataset_name)}
+    delta = [example for example in examples if _inputs_key(example["inputs"]) not in existing]
+    if not delta:
+        print(f"📁 Using existing dataset: {dataset_name}")
+        return
+    
+    dataset = client.read_dataset(dataset_name=dataset_name)
+    _create_examples_batched(client, dataset.id, delta)
+    print(f"📁 Using existing dataset: {dataset_name} (added {len(delta)} new examples)")
@@ -0,0 +1,25 @@
+"""Non-blocking logging setup for evaluation runs."""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+def configure_eval_logging(level: int = logging.INFO) -> None:
+    """Route log records through a queue so concurrent eval tasks never block on stdout.
+
+    Args:
+        level: Root logging level
+    """
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
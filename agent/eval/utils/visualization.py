@@ -1,9 +1,24 @@
 """Visualization utilities for evaluation results."""
 
+import json
 import os
-import matplotlib.pyplot as plt
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+# Charts are opt-in; otherwise each run saves its metrics as JSON
+_plots_enabled = False
+
+def set_plots_enabled(enabled: bool) -> None:
+    """Render PNG charts instead of JSON reports for this process."""
+    global _plots_enabled
+    _plots_enabled = enabled
+
+def _pyplot():
+    """Import pyplot on first use, on the headless Agg backend."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
 
 def create_evaluation_plots(scores: Dict[str, float], title: str = "Evaluation Results") -> None:
     """Create bar plots for evaluation scores.
@@ -12,6 +27,7 @@ def create_evaluation_plots(scores: Dict[str, float], title: str = "Evaluation R
         scores: Dictionary mapping metric names to scores
         title: Overall title for the plots
     """
+    plt = _pyplot()
     plt.figure(figsize=(12, 6))
     
     metric_names = list(scores.keys())
@@ -46,13 +62,39 @@ def save_results_plot(eval_type: str, output_dir: str = "eval/results") -> str:
     Returns:
         Path to saved plot
     """
+    plt = _pyplot()
     os.makedirs(output_dir, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     plot_path = f'{output_dir}/{eval_type}_evaluation_{timestamp}.png'
-    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
+    plt.savefig(plot_path, dpi=150, bbox_inches='tight')
     plt.close()
     return plot_path
 
+def save_results(eval_type: str, scores: Dict[str, float], title: str,
+                 results: Optional[Dict[str, Any]] = None, output_dir: str = "eval/results") -> str:
+    """Save a chart of the scores if plots are enabled, otherwise a JSON report.
+    
+    Args:
+        eval_type: Type of evaluation (e.g., 'classification', 'e2e')
+        scores: Dictionary mapping metric names to scores
+        title: Chart title
+        results: Full metrics for the JSON report (defaults to scores)
+        output_dir: Directory to save results
+        
+    Returns:
+        Path to the saved chart or report
+    """
+    if _plots_enabled:
+        create_evaluation_plots(scores, title)
+        return save_results_plot(eval_type, output_dir)
+    
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = f'{output_dir}/{eval_type}_evaluation_{timestamp}.json'
+    with open(report_path, "w") as f:
+        json.dump(results if results is not None else scores, f, indent=2, default=str)
+    return report_path
+
 def create_comparison_plot(results: List[Dict[str, Any]], metric_name: str, 
                          title: str = "Evaluation Comparison") -> None:
     """Create comparison plot across multiple evaluation runs.
@@ -62,6 +104,7 @@ def create_comparison_plot(results: List[Dict[str, Any]], metric_name: str,
         metric_name: Name of metric to compare
         title: Plot title
     """
+    plt = _pyplot()
     plt.figure(figsize=(10, 6))
     
     run_names = [f"Run {i+1}" for i in range(len(results))]
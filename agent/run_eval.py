@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 """Main evaluation runner for the research agent project."""
 
-import asyncio
 import sys
 import argparse
 from pathlib import Path
@@ -10,6 +9,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from eval.scripts.run_all_evaluations import run_specific_evaluation
+from eval.utils.visualization import set_plots_enabled
+from eval.utils.log_queue import configure_eval_logging
+from eval.utils.event_loop import run_evaluation
 
 def main():
     """Main entry point for evaluations."""
@@ -21,6 +23,9 @@ Examples:
   python run_eval.py --type all              # Run all evaluations
   python run_eval.py --type classification   # Run classification unit tests only
   python run_eval.py --type e2e              # Run end-to-end tests only
+  python run_eval.py --type e2e --judge-mode batch  # Judge via the OpenAI Batch API
+  python run_eval.py --force-rerun           # Rerun even if sources are unchanged
+  python run_eval.py --type all --plots      # Save PNG charts instead of JSON reports
   
   # Alternative: Run specific evaluation modules directly
   python -m eval.scripts.run_classification_only
@@ -36,6 +41,32 @@ Examples:
         help="Type of evaluation to run (default: all)"
     )
     
+    parser.add_argument(
+        "--judge-mode",
+        choices=["sync", "deferred", "batch"],
+        default="sync",
+        help="Judge E2E samples as they finish, together after all runs, or in one OpenAI Batch API job (default: sync)"
+    )
+    
+    parser.add_argument(
+        "--cache-overwrite",
+        action="store_true",
+        help="Ignore cached judge verdicts and refresh them"
+    )
+    
+    parser.add_argument(
+        "--plots",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Save PNG charts instead of JSON reports (default: --no-plots)"
+    )
+    
+    parser.add_argument(
+        "--force-rerun",
+        action="store_true",
+        help="Run new experiments even if LangSmith has one for the current sources"
+    )
+    
     parser.add_argument(
         "--verbose", "-v", 
         action="store_true",
@@ -43,6 +74,8 @@ Examples:
     )
     
     args = parser.parse_args()
+    set_plots_enabled(args.plots)
+    configure_eval_logging()
     
     if args.verbose:
         print(f"🚀 Starting {args.type} evaluation...")
@@ -51,7 +84,9 @@ Examples:
         print("-" * 50)
     
     try:
-        results = asyncio.run(run_specific_evaluation(args.type))
+        results = run_evaluation(run_specific_evaluation(
+            args.type, args.judge_mode, args.force_rerun, args.cache_overwrite
+        ))
         
         if args.verbose:
             print(f"\n✅ Evaluation completed successfully!")
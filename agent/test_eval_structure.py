@@ -3,9 +3,6 @@
 import sys
 from pathlib import Path
 
-# Add current directory to path
-sys.path.insert(0, str(Path(__file__).parent))
-
 def test_imports():
     """Test that all evaluation modules can be imported."""
     print("🧪 Testing evaluation structure...")
@@ -0,0 +1,126 @@
+"""Test that --cache-overwrite with batch judging calls the judge once per prompt."""
+
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from eval.e2e_tests import evaluate_research_e2e as e2e
+from eval.utils import judge_cache
+
+STALE = e2e.ResearchQualityGrade(
+    classification_correct=True,
+    criteria_analysis="stale",
+    overall_quality=1,
+    grade=False,
+    justification="cached by an earlier run",
+)
+FRESH = e2e.ResearchQualityGrade(
+    classification_correct=True,
+    criteria_analysis="fresh",
+    overall_quality=5,
+    grade=True,
+    justification="judged in this run",
+)
+
+
+class FakeJudge:
+    """Stands in for evaluator_llm and counts per-sample judge calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return FRESH
+
+
+class FakeBatchClient:
+    """Stands in for AsyncOpenAI, answering every batch request with the fresh verdict."""
+
+    requests = []
+
+    def __init__(self):
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._create_batch)
+
+    async def _create_file(self, file, purpose):
+        FakeBatchClient.requests.extend(json.loads(line) for line in file[1].decode().splitlines())
+        return SimpleNamespace(id="file-in")
+
+    async def _create_batch(self, *args, **kwargs):
+        return SimpleNamespace(id="batch", status="completed", output_file_id="file-out")
+
+    async def _content(self, file_id):
+        lines = [
+            json.dumps({
+                "custom_id": request["custom_id"],
+                "response": {"body": {"choices": [{"message": {"content": FRESH.model_dump_json()}}]}},
+            })
+            for request in FakeBatchClient.requests
+        ]
+        return SimpleNamespace(text="\n".join(lines))
+
+
+class FakeExperimentResults:
+    """Async-iterable rows shaped like aevaluate results."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def __aiter__(self):
+        for row in self.rows:
+            yield row
+
+
+def _rows():
+    """Two samples with distinct responses, one of them repeated."""
+    reference = {"classification": "DIRECT_ANSWER", "success_criteria": ["• Answers the question"]}
+    rows = []
+    for response in ("first answer", "second answer", "first answer"):
+        outputs = {"classification_decision": "DIRECT_ANSWER", "final_response": response}
+        rows.append({
+            "run": SimpleNamespace(outputs=outputs),
+            "example": SimpleNamespace(outputs=reference),
+        })
+    return rows
+
+
+async def _judge_with_overwrite(rows):
+    verdicts = await e2e.judge_deferred(FakeExperimentResults(rows), "batch", cache_overwrite=True)
+    evaluator = e2e.make_research_quality_evaluator(cache_overwrite=True, verdicts=verdicts)
+    return [await evaluator(row["run"].outputs, row["example"].outputs) for row in rows]
+
+
+def test_overwrite_batch_judges_each_prompt_once():
+    """Batch verdicts from this run score the experiment without re-judging."""
+    rows = _rows()
+    prompts = {e2e._evaluation_prompt(row["run"].outputs, row["example"].outputs) for row in rows}
+    judge = FakeJudge()
+    FakeBatchClient.requests = []
+
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            mock.patch.object(judge_cache, "CACHE_PATH", Path(cache_dir) / "judge.db"), \
+            mock.patch.object(e2e, "evaluator_llm", judge), \
+            mock.patch("openai.AsyncOpenAI", FakeBatchClient):
+        judge_cache._connect.cache_clear()
+        try:
+            # Verdicts from an earlier run must be replaced, not reused
+            for prompt in prompts:
+                judge_cache.cache_verdict(prompt, STALE.model_dump_json())
+            results = asyncio.run(_judge_with_overwrite(rows))
+        finally:
+            judge_cache._connect().close()
+            judge_cache._connect.cache_clear()
+
+    batched_prompts = [request["body"]["messages"][0]["content"] for request in FakeBatchClient.requests]
+    assert sorted(batched_prompts) == sorted(prompts), "each prompt is batch-judged exactly once"
+    assert judge.calls == 0, "scoring must not re-judge samples judged by the batch job"
+    assert all(result["score"] == 1.0 for result in results), "fresh verdicts replace stale ones"
+
+
+if __name__ == "__main__":
+    test_overwrite_batch_judges_each_prompt_once()
+    print("✅ Overwrite + batch judging calls the judge once per prompt")
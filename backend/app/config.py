@@ -2,20 +2,24 @@
 
 import os
 import re
+from pathlib import Path
 from langgraph_sdk import get_client
 from dotenv import load_dotenv
 
-# Load environment variables - local .env takes precedence over root .env
-load_dotenv(dotenv_path="../../.env")  # Root .env first
-load_dotenv(dotenv_path="../.env")  # Backend .env second (overrides root if present)
+# Load environment variables from paths resolved against this file, not the CWD.
+# Values already set win, so the backend .env goes first to take precedence over
+# the repo root .env, and real environment variables take precedence over both
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+for env_path in (BACKEND_DIR / ".env", BACKEND_DIR.parent / ".env"):
+    load_dotenv(dotenv_path=env_path)
 
 # Constants
 SSE_HEADERS = {"Cache-Control": "no-cache", "Connection": "keep-alive"}
-TOKEN_PATTERN = re.compile(r"\S+\s*|\n")
+
+# Fallback search result fields in unstructured ToolMessage content
+TITLE_PATTERN = re.compile(r"Title:\s*(.+?)(?=\n|$)", re.IGNORECASE)
+HTTP_URL_PATTERN = re.compile(r"URL:\s*(https?://[^\s\n]+)", re.IGNORECASE)
 
 # LangGraph client setup - default to localhost for combined deployment
 LANGGRAPH_SERVER_URL = os.getenv("LANGGRAPH_SERVER_URL", "http://localhost:2024")
-langgraph_client = get_client(url=LANGGRAPH_SERVER_URL)
-
-# Store mapping of custom thread IDs to actual LangGraph thread IDs
-thread_id_mapping = {}
\ No newline at end of file
+langgraph_client = get_client(url=LANGGRAPH_SERVER_URL)
\ No newline at end of file
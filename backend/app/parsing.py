@@ -0,0 +1,80 @@
+"""Parsing of search tool output for the agent API."""
+
+from typing import List
+from pydantic import BaseModel
+
+from .config import HTTP_URL_PATTERN, TITLE_PATTERN
+
+# Internal classification/planning AI messages that are not shown in the chat
+INTERNAL_MESSAGE_PREFIXES = ("Classification:", "Planned")
+
+
+class SearchResult(BaseModel):
+    title: str
+    url: str
+    content: str
+    query: str
+
+
+def parse_tool_message_content(
+    content: str, search_index: int, query_name: str
+) -> List[SearchResult]:
+    """Parse ToolMessage content to extract all search results with URLs using robust pattern matching.
+
+    Results hold strings parsed here, so they are built without validation.
+    """
+    results = []
+
+    # Results are "Title:/URL:/Content:" blocks separated by blank lines. Walk the
+    # lines once; the trailing "" flushes the last block
+    title = url = None
+    content_lines: List[str] = []
+    in_content = False
+    for line in [*content.splitlines(), ""]:
+        if not line.strip():
+            if title and url:
+                results.append(
+                    SearchResult.model_construct(
+                        title=title,
+                        url=url,
+                        content="\n".join(content_lines).strip(),
+                        query=query_name,
+                    )
+                )
+            title = url = None
+            content_lines = []
+            in_content = False
+        elif in_content:
+            # Content runs to the end of its block
+            content_lines.append(line)
+        else:
+            field = line[:8].lower()
+            if field.startswith("title:") and title is None:
+                title = line[6:].strip()
+            elif field.startswith("url:") and url is None:
+                url = line[4:].strip()
+            elif field.startswith("content:"):
+                content_lines.append(line[8:])
+                in_content = True
+
+    # Fallback: If no results, try finding all URLs regardless of structure
+    if not results:
+        # Find all URLs in the content
+        urls = HTTP_URL_PATTERN.findall(content)
+
+        # Find all titles
+        titles = TITLE_PATTERN.findall(content)
+
+        # Pair them up
+        for i, url in enumerate(urls):
+            title = titles[i] if i < len(titles) else f"Result {i + 1}"
+            results.append(
+                SearchResult.model_construct(
+                    title=title.strip(),
+                    url=url.strip(),
+                    content="",
+                    query=query_name,
+                )
+            )
+
+    return results
@@ -1,14 +1,14 @@
 """API routes for the agent service."""
 
-import re
-from typing import List, Dict, Any
-from fastapi import APIRouter, HTTPException
+from typing import Any, Dict, Iterator, List
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from langgraph_sdk.schema import Command
 from pydantic import BaseModel
 
 from .config import SSE_HEADERS, langgraph_client
 from .models import AgentQuery
+from .parsing import INTERNAL_MESSAGE_PREFIXES, SearchResult, parse_tool_message_content
 from .streaming import stream_agent_response
 from .thread_manager import check_thread_interrupt_status
 from .utils import json_sse
@@ -30,7 +30,7 @@ async def query_agent(query: AgentQuery):
                 command=Command(resume=query.message),
                 start_message=start_msg,
             ),
-            media_type="text/plain",
+            media_type="text/event-stream",
             headers=SSE_HEADERS,
         )
     
@@ -47,7 +47,7 @@ async def query_agent(query: AgentQuery):
                 command=Command(resume=query.message),
                 start_message=start_msg,
             ),
-            media_type="text/plain",
+            media_type="text/event-stream",
             headers=SSE_HEADERS,
         )
     else:
@@ -61,7 +61,7 @@ async def query_agent(query: AgentQuery):
                 input_data=input_payload,
                 start_message=start_msg,
             ),
-            media_type="text/plain",
+            media_type="text/event-stream",
             headers=SSE_HEADERS,
         )
 
@@ -70,13 +70,6 @@ async def query_agent(query: AgentQuery):
 from typing import Optional
 
 
-class SearchResult(BaseModel):
-    title: str
-    url: str
-    content: str
-    query: str
-
-
 class ChatMessage(BaseModel):
     id: str
     type: str  # 'user', 'assistant', or 'tool'
@@ -91,70 +84,13 @@ class StateResponse(BaseModel):
     thread_id: str
 
 
-def parse_tool_message_content(
-    content: str, search_index: int, query_name: str
-) -> List[SearchResult]:
-    """Parse ToolMessage content to extract all search results with URLs using robust pattern matching."""
-    results = []
-
-    # Split by double newlines and parse each block
-    result_blocks = content.split("\n\n")
-
-    for block in result_blocks:
-        if not block.strip():
-            continue
-
-        # Extract title, URL, and content using regex
-        title_match = re.search(r"Title:\s*(.+?)(?=\n|$)", block, re.IGNORECASE)
-        url_match = re.search(r"URL:\s*(.+?)(?=\n|$)", block, re.IGNORECASE)
-        content_match = re.search(
-            r"Content:\s*(.+?)(?=\n\nTitle:|$)", block, re.DOTALL | re.IGNORECASE
-        )
-
-        if title_match and url_match:
-            title = title_match.group(1).strip()
-            url = url_match.group(1).strip()
-            content_text = content_match.group(1).strip() if content_match else ""
-
-            results.append(
-                SearchResult(
-                    title=title,
-                    url=url,
-                    content=content_text,
-                    query=query_name,
-                )
-            )
-
-    # Fallback: If no results, try finding all URLs regardless of structure
-    if not results:
-        # Find all URLs in the content
-        url_pattern = r"URL:\s*(https?://[^\s\n]+)"
-        urls = re.findall(url_pattern, content, re.IGNORECASE)
-
-        # Find all titles
-        title_pattern = r"Title:\s*(.+?)(?=\n|$)"
-        titles = re.findall(title_pattern, content, re.IGNORECASE)
-
-        # Pair them up
-        for i, url in enumerate(urls):
-            title = titles[i] if i < len(titles) else f"Result {i + 1}"
-            results.append(
-                SearchResult(
-                    title=title.strip(),
-                    url=url.strip(),
-                    content="",
-                    query=query_name,
-                )
-            )
-
-    return results
-
+def iter_chat_messages(state: Dict[str, Any]) -> Iterator[ChatMessage]:
+    """Yield chat messages including tool messages from LangGraph state.
 
-def extract_messages_and_searches(
-    state: Dict[str, Any],
-) -> tuple[List[ChatMessage], List[SearchResult]]:
-    """Extract chat messages including tool messages from LangGraph state."""
-    messages = []
+    Messages are built without validation; StateResponse validates them once when
+    the route's response is serialized.
+    """
+    emitted = 0
     search_index = 0
     planned_queries = state.get("planned_queries", [])
 
@@ -163,25 +99,21 @@ def extract_messages_and_searches(
         content = msg.get("content", "")
 
         if msg_type == "human":
-            messages.append(
-                ChatMessage(
-                    id=msg.get("id", f"human_{len(messages)}"),
-                    type="user",
-                    content=content,
-                )
+            yield ChatMessage.model_construct(
+                id=msg.get("id") or f"human_{emitted}",
+                type="user",
+                content=content,
             )
+            emitted += 1
         elif msg_type == "ai":
             # Skip internal classification/planning messages
-            if not (
-                content.startswith("Classification:") or content.startswith("Planned")
-            ):
-                messages.append(
-                    ChatMessage(
-                        id=msg.get("id", f"ai_{len(messages)}"),
-                        type="assistant",
-                        content=content,
-                    )
+            if not content.startswith(INTERNAL_MESSAGE_PREFIXES):
+                yield ChatMessage.model_construct(
+                    id=msg.get("id") or f"ai_{emitted}",
+                    type="assistant",
+                    content=content,
                 )
+                emitted += 1
         elif msg_type == "tool":
             # Include tool messages as search result messages in the chronological flow
             query_name = (
@@ -192,19 +124,15 @@ def extract_messages_and_searches(
             tool_results = parse_tool_message_content(content, search_index, query_name)
 
             # Add tool message as a special message type containing search results
-            messages.append(
-                ChatMessage(
-                    id=msg.get("id", f"tool_{len(messages)}"),
-                    type="tool",
-                    content="",  # No content for tool messages
-                    search_results=tool_results,
-                )
+            yield ChatMessage.model_construct(
+                id=msg.get("id") or f"tool_{emitted}",
+                type="tool",
+                content="",  # No content for tool messages
+                search_results=tool_results,
             )
+            emitted += 1
             search_index += 1
 
-    # Return empty search_results since they're now embedded in messages
-    return messages, []
-
 
 @router.get("/health")
 async def health_check():
@@ -230,7 +158,12 @@ async def create_thread():
 
 
 @router.get("/state/{thread_id}", response_model=StateResponse)
-async def get_thread_state(thread_id: str):
+async def get_thread_state(
+    thread_id: str,
+    include_subgraphs: bool = Query(
+        False, description="Also fetch subgraph state (not used to build the response)"
+    ),
+):
     """Fetch the complete state for a thread and extract messages and search results."""
     try:
         print(f"🔍 Fetching state for thread: {thread_id}")
@@ -238,13 +171,13 @@ async def get_thread_state(thread_id: str):
         # Fetch state from LangGraph directly using the provided thread_id
         try:
             state = await langgraph_client.threads.get_state(
-                thread_id=thread_id, subgraphs=True
+                thread_id=thread_id, subgraphs=include_subgraphs
             )
             print(f"🔍 Got state (async): {type(state)}")
         except TypeError:
             # If get_state is not async, call it directly
             state = langgraph_client.threads.get_state(
-                thread_id=thread_id, subgraphs=True
+                thread_id=thread_id, subgraphs=include_subgraphs
             )
             print(f"🔍 Got state (sync): {type(state)}")
         except Exception as e:
@@ -274,16 +207,12 @@ async def get_thread_state(thread_id: str):
             state_values = state
             print(f"🔍 Using state directly: {type(state_values)}")
 
-        # Extract messages and search results
-        messages, search_results = extract_messages_and_searches(state_values)
+        # Search results are embedded in the tool messages
+        messages = list(iter_chat_messages(state_values))
 
-        print(
-            f"🔍 Extracted {len(messages)} messages, {len(search_results)} search results"
-        )
+        print(f"🔍 Extracted {len(messages)} messages")
 
-        return StateResponse(
-            messages=messages, search_results=search_results, thread_id=thread_id
-        )
+        return StateResponse(messages=messages, search_results=[], thread_id=thread_id)
 
     except HTTPException:
         raise
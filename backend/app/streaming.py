@@ -5,8 +5,37 @@ import time
 from typing import AsyncGenerator, Optional
 from langgraph_sdk.schema import Command
 
-from .config import langgraph_client, TOKEN_PATTERN
-from .utils import get_status_message, json_sse
+from .config import langgraph_client
+from .parsing import parse_tool_message_content
+from .utils import STATUS_EVENTS, answer_sse, content_sse, get_status_message, json_sse
+
+start_sse = content_sse("start")
+status_sse = content_sse("status")
+planning_summary_sse = content_sse("planning_summary")
+planned_query_sse = content_sse("planned_query")
+summarization_start_sse = content_sse("summarization_start")
+search_results_sse = content_sse("search_results")
+tool_message_sse = content_sse("tool_message")
+interrupt_sse = content_sse("interrupt")
+
+# Frames whose content never changes are encoded once
+DIRECT_ANSWER_START_FRAME = summarization_start_sse("🧠 Generating direct answer...")
+SUMMARIZATION_START_FRAME = summarization_start_sse("🧠 Generating comprehensive answer...")
+REVIEW_INTERRUPT_FRAME = interrupt_sse("Please provide feedback on the planned queries.")
+
+INTERRUPT_EVENTS = frozenset({"interrupt", "on_interrupt"})
+# Events requested via stream_mode; only other event names need the substring check
+KNOWN_STREAM_EVENTS = frozenset(
+    {
+        "metadata",
+        "values",
+        "updates",
+        "events",
+        "messages/metadata",
+        "messages/partial",
+        "messages/complete",
+    }
+)
 
 
 async def stream_agent_response(
@@ -14,7 +43,7 @@ async def stream_agent_response(
     input_data: Optional[dict] = None,
     command: Optional[Command] = None,
     start_message: str = "",
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """Stream agent responses."""
     try:
         # Use thread_id directly - it comes from backend thread creation
@@ -24,7 +53,7 @@ async def stream_agent_response(
         first_answer_time = None
 
         if start_message:
-            yield json_sse({"type": "start", "content": start_message})
+            yield start_sse(start_message)
 
         # Build stream parameters
         params = {
@@ -35,6 +64,7 @@ async def stream_agent_response(
         }
 
         previous_messages = []
+        tool_count = 0  # Tool messages in previous_messages, i.e. the next search index
         interrupt_sent = False  # Track if we've already sent an interrupt
         previous_content_length = 0  # Track content length for incremental streaming
         current_ai_message_id = None  # Track current AI message to detect new responses
@@ -55,47 +85,34 @@ async def stream_agent_response(
                         checkpoint_ns = run_data["metadata"].get("checkpoint_ns", "")
                         if checkpoint_ns.startswith("direct_answer"):
                             in_direct_answer = True
-                            yield json_sse(
-                                {
-                                    "type": "summarization_start",
-                                    "content": "🧠 Generating direct answer...",
-                                }
-                            )
+                            yield DIRECT_ANSWER_START_FRAME
                             break
 
-            # Send status updates
-            status_msg = get_status_message(chunk)
-            if status_msg:
-                yield json_sse({"type": "status", "content": status_msg})
+            # Send status updates; token events never carry one
+            if event in STATUS_EVENTS:
+                status_msg = get_status_message(event, data)
+                if status_msg:
+                    yield status_sse(status_msg)
 
-            # Handle planning - inline the logic
-            if event == "updates" and "planning" in data:
-                queries = data["planning"].get("planned_queries", [])
+            # Handle planning - queries come from classification or a planning revision
+            if event == "updates" and ("planning" in data or "classification" in data):
+                node_update = data.get("planning") or data.get("classification") or {}
+                queries = node_update.get("planned_queries", [])
                 if queries:
-                    yield json_sse(
-                        {
-                            "type": "planning_summary",
-                            "content": f"🧠 Planned {len(queries)} search queries:",
-                        }
+                    # One write for the summary and every query frame
+                    frames = [
+                        planning_summary_sse(f"🧠 Planned {len(queries)} search queries:")
+                    ]
+                    frames.extend(
+                        planned_query_sse(f"{i}. {query}")
+                        for i, query in enumerate(queries, 1)
                     )
-                    for i, query in enumerate(queries, 1):
-                        yield json_sse(
-                            {"type": "planned_query", "content": f"{i}. {query}"}
-                        )
+                    yield b"".join(frames)
 
-            # Handle search operations
+            # Search node runs every planned query, so summarization starts next
             elif event == "updates" and "search" in data:
-                pass
-
-            # Handle entering summarization node
-            elif event == "updates" and "pre_summarize" in data:
                 in_summarization = True
-                yield json_sse(
-                    {
-                        "type": "summarization_start",
-                        "content": "🧠 Generating comprehensive answer...",
-                    }
-                )
+                yield SUMMARIZATION_START_FRAME
 
             # Handle summarization operations
             elif event == "updates" and "summarize" in data:
@@ -117,18 +134,16 @@ async def stream_agent_response(
                             current_ai_message_id = message_id
                             previous_content_length = 0
 
-                        # Extract only the new content since last update
-                        new_content = full_content[previous_content_length:]
-
-                        if new_content:
+                        # Partial messages are append-only, so only the tail past
+                        # the previous length is new; skip chunks that add nothing
+                        content_length = len(full_content)
+                        if content_length > previous_content_length:
                             if first_answer_time is None:
                                 first_answer_time = current_time
 
                             # Stream only the new token(s)
-                            yield json_sse({"type": "answer", "content": new_content})
-
-                            # Update the previous content length
-                            previous_content_length = len(full_content)
+                            yield answer_sse(full_content[previous_content_length:])
+                            previous_content_length = content_length
 
             # Handle search results from values event
             elif event == "values" and "search" in data:
@@ -136,18 +151,25 @@ async def stream_agent_response(
                 search_results = search_data.get("search_results", [])
                 tool_messages = search_data.get("messages", [])
                 
-                # Send tool messages with search results attached (for consistency with thread restore)
+                # The search node names each ToolMessage search_{n}, where n indexes
+                # the accumulated search_results
+                results_by_tool_call = {
+                    f"search_{n}": search_result
+                    for n, search_result in enumerate(search_results)
+                }
+
+                # Send tool messages with search results attached (for consistency with thread restore),
+                # coalesced into one write per chunk
+                frames = []
                 for i, tool_message in enumerate(tool_messages):
                     if tool_message.get("type") == "tool":
                         # Extract tool_call_id to match with search results
                         tool_call_id = tool_message.get("tool_call_id", f"search_{i+1}")
                         
                         # Find corresponding search result
-                        matching_search_result = None
-                        for search_result in search_results:
-                            if search_result.get("query", "").endswith(f"_{i+1}") or i < len(search_results):
-                                matching_search_result = search_result
-                                break
+                        matching_search_result = results_by_tool_call.get(tool_call_id) or (
+                            search_results[i] if i < len(search_results) else None
+                        )
                         
                         # Create tool message with search results
                         tool_msg_data = {
@@ -158,31 +180,27 @@ async def stream_agent_response(
                             "tool_call_id": tool_call_id,
                             "timestamp": tool_message.get("timestamp", "")
                         }
-                        yield json_sse({"type": "tool_message", "content": tool_msg_data})
+                        frames.append(tool_message_sse(tool_msg_data))
                 
                 # Also send search results for backward compatibility
                 if search_results:
-                    yield json_sse(
-                        {"type": "search_results", "content": search_results}
-                    )
+                    frames.append(search_results_sse(search_results))
+                if frames:
+                    yield b"".join(frames)
 
             # Handle final answers and tool messages
             elif event == "values":
                 current_messages = data.get("messages", [])
 
-                # Check for new tool messages (search results)
+                # Check for new tool messages (search results), one write per chunk
+                frames = []
                 if len(current_messages) > len(previous_messages):
                     for i in range(len(previous_messages), len(current_messages)):
                         msg = current_messages[i]
                         if msg.get("type") == "tool":
                             # Parse and emit search results
-                            from .routes import parse_tool_message_content
-
-                            search_index = sum(
-                                1
-                                for m in current_messages[:i]
-                                if m.get("type") == "tool"
-                            )
+                            search_index = tool_count
+                            tool_count += 1
                             planned_queries = data.get("planned_queries", [])
                             query_name = (
                                 planned_queries[search_index]
@@ -204,30 +222,17 @@ async def stream_agent_response(
                                     }
                                     for result in results
                                 ]
-                                yield json_sse(
-                                    {"type": "search_results", "content": results_dict}
-                                )
-
-                # Skip streaming completed AI messages since we now handle them in real-time via "messages" mode
-                # Only handle final state tracking here
-                if (
-                    len(current_messages) > len(previous_messages)
-                    and current_messages
-                    and current_messages[-1].get("type") == "ai"
-                ):
-                    content = current_messages[-1].get("content", "")
-                    # Only log completion, don't stream tokens here
-                    if content and not any(
-                        skip_phrase in content
-                        for skip_phrase in ["Planned", "Classification:"]
-                    ):
-                        pass
+                                frames.append(search_results_sse(results_dict))
+                if frames:
+                    yield b"".join(frames)
 
+                # Completed AI messages are not re-sent; answers stream via "messages" mode
                 previous_messages = current_messages
 
             # Handle interrupts - check multiple possible event types
             elif not interrupt_sent and (
-                event in ["interrupt", "on_interrupt"] or "interrupt" in event.lower()
+                event in INTERRUPT_EVENTS
+                or (event not in KNOWN_STREAM_EVENTS and "interrupt" in event.lower())
             ):
                 try:
                     # If data is a string (the interrupt message), use it directly
@@ -241,22 +246,16 @@ async def stream_agent_response(
                     else:
                         interrupt_content = str(data)
 
-                    yield json_sse({"type": "interrupt", "content": interrupt_content})
+                    yield interrupt_sse(interrupt_content)
                     interrupt_sent = True  # Mark that we've sent an interrupt
                 except Exception:
-                    yield json_sse(
-                        {
-                            "type": "interrupt",
-                            "content": "Please provide feedback on the planned queries.",
-                        }
-                    )
+                    yield REVIEW_INTERRUPT_FRAME
                     interrupt_sent = True
 
             # Handle LangGraph interrupt signal
             elif not interrupt_sent and event == "updates" and "__interrupt__" in data:
                 # This is the proper interrupt from LangGraph
-                review_message = "Please provide feedback on the planned queries."
-                yield json_sse({"type": "interrupt", "content": review_message})
+                yield REVIEW_INTERRUPT_FRAME
                 interrupt_sent = True
 
                 # Break out of the stream loop to pause execution
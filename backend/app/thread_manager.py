@@ -1,16 +1,25 @@
 """Thread management for the agent API."""
 
+from uuid import UUID
+
 from .config import langgraph_client
 
 
 async def check_thread_interrupt_status(thread_id: str) -> bool:
     """Check if thread has a pending interrupt that needs resolution."""
+    try:
+        # The LangGraph server only issues UUID thread ids; skip the round trip otherwise
+        UUID(thread_id)
+    except ValueError:
+        return False
+
     try:
         # Get the thread state to check for interrupts using thread_id directly
         thread_state = await langgraph_client.threads.get_state(thread_id=thread_id)
         
-        # Check if there's an interrupt in the thread state
-        # LangGraph typically stores interrupt information in the state
-        return thread_state.get("next", []) == ["__interrupt__"] or "interrupt" in str(thread_state)
+        # A paused thread lists the pending interrupt on the task that raised it
+        return thread_state.get("next", []) == ["__interrupt__"] or any(
+            task.get("interrupts") for task in thread_state.get("tasks", [])
+        )
     except Exception:
         return False
\ No newline at end of file
@@ -1,31 +1,62 @@
 """Utility functions for the agent API."""
 
-import json
+from typing import Any, Callable
 
+import orjson
 
-def get_status_message(chunk):
-    """Generate contextual status messages based on stream data."""
-    event = getattr(chunk, "event", "")
-    data = getattr(chunk, "data", {})
+_CLASSIFICATION_STATUS = {
+    True: "🔍 Query requires web search...",
+    False: "💬 Answering from history...",
+}
 
-    if event == "metadata":
-        return "🤖 Initializing agent..."
 
-    if event == "updates":
-        if "classification" in data:
-            return (
-                "🔍 Query requires web search..."
-                if data["classification"].get("needs_search")
-                else "💬 Answering from history..."
-            )
-        if "search" in data:
-            count = data["search"].get("search_count", 0)
-            total = len(data["search"].get("planned_queries", []))
-            return f"🔍 Searching ({count}/{total})..."
+def _metadata_status(data):
+    return "🤖 Initializing agent..."
 
+
+def _updates_status(data):
+    classification = data.get("classification")
+    if classification is not None:
+        return _CLASSIFICATION_STATUS[bool(classification.get("needs_search"))]
+    search = data.get("search")
+    if search is not None:
+        count = search.get("search_count", 0)
+        # The search node reports all planned searches in a single update
+        total = len(search.get("planned_queries", [])) or count
+        return f"🔍 Searching ({count}/{total})..."
     return None
 
 
-def json_sse(data):
+_STATUS_HANDLERS = {"metadata": _metadata_status, "updates": _updates_status}
+
+# Stream events get_status_message can produce a status for
+STATUS_EVENTS = frozenset(_STATUS_HANDLERS)
+
+
+def get_status_message(event: str, data: dict):
+    """Generate contextual status messages based on a stream chunk's event and data."""
+    handler = _STATUS_HANDLERS.get(event)
+    return handler(data) if handler else None
+
+
+def json_sse(data) -> bytes:
     """Format data as SSE JSON."""
-    return f"data: {json.dumps(data)}\n\n"
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+def content_sse(event_type: str) -> Callable[[Any], bytes]:
+    """Build a formatter for {"type": event_type, "content": ...} SSE frames.
+
+    The constant part of the frame is encoded once, so each call only encodes the
+    content and builds no event dict.
+    """
+    prefix = b'data: {"type":' + orjson.dumps(event_type) + b',"content":'
+
+    def format_frame(content: Any) -> bytes:
+        return prefix + orjson.dumps(content) + b"}\n\n"
+
+    return format_frame
+
+
+# Answer tokens are by far the most frequent frame in a stream
+answer_sse = content_sse("answer")
@@ -1,26 +1,37 @@
 """Main FastAPI application for the agent service."""
 
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
-from app.routes import router
+from fastapi.responses import ORJSONResponse
+from app.config import langgraph_client
+from app.routes import router  # Loads the backend and root .env files via app.config
 
-# Load environment variables
-load_dotenv(dotenv_path="../.env")
-load_dotenv()
 
-app = FastAPI(title="Agent API", description="LangGraph agent streaming API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close the shared LangGraph client's connection pool on shutdown."""
+    yield
+    await langgraph_client.aclose()
+
+
+app = FastAPI(
+    title="Agent API",
+    description="LangGraph agent streaming API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # Get frontend URL from environment
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://127.0.0.1:5173")
 
-# Add CORS middleware
-frontend_origins = [
+# Add CORS middleware; dict.fromkeys drops FRONTEND_URL when it repeats a dev origin
+frontend_origins = list(dict.fromkeys([
     FRONTEND_URL.rstrip("/"),  # Remove trailing slash if present
     "http://localhost:5173",
     "http://127.0.0.1:5173"
-]
+]))
 
 app.add_middleware(
     CORSMiddleware,
@@ -36,4 +47,6 @@ app.include_router(router)
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # Workers need the import string; WEB_CONCURRENCY matches the uvicorn CLI default
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
+    uvicorn.run("main:app", host="0.0.0.0", port=port, workers=workers)
\ No newline at end of file